@@ -0,0 +1,96 @@
+"""
+    Benchmark of the JSON codecs on Teamcenter service payloads
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'bench_codec.py'
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from teamcenter import codec
+from bench_matlab_content import make_spec_contents
+
+
+def load_payloads(paths):
+    """Recorded response bodies, or a synthetic expandPSAllLevels response"""
+    payloads = []
+    for path in paths:
+        with open(path, 'rb') as fp:
+            payloads.append((Path(path).name, fp.read()))
+
+    return payloads
+
+
+def synthetic_payload(lines):
+    _, contents = make_spec_contents(lines)
+    for o in contents["ServiceData"]["modelObjects"].values():
+        o["className"] = o["type"] = "Requirement Revision"
+        for name in ("object_desc", "last_mod_date", "owning_user", "release_status_list"):
+            o.setdefault("props", {})[name] = {"dbValues": ["x" * 16], "uiValues": ["x" * 16]}
+
+    return ('synthetic-{}'.format(lines), codec.JsonCodec().dumps(contents))
+
+
+def best_of(fn, arg, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON codecs on service payloads')
+    parser.add_argument('payloads', nargs='*', help='recorded JSON response bodies')
+    parser.add_argument('--lines', type=int, default=20000, help='synthetic BOM lines when no payloads are given')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads) or [synthetic_payload(args.lines)]
+
+    for name in codec.CODECS:
+        try:
+            c = codec.create_codec(name)
+        except ImportError:
+            print('{:8} not installed'.format(name))
+            continue
+
+        for payload_name, data in payloads:
+            obj = c.loads(data)
+            loads = best_of(c.loads, data, args.repeat)
+            dumps = best_of(c.dumps, obj, args.repeat)
+            print('{:8} {:24} {:8.1f} MB  loads {:.3f}s  dumps {:.3f}s'.format(
+                name, payload_name, len(data) / 1e6, loads, dumps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+    Benchmark of the cold import time of the teamcenter modules
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'bench_import.py'
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+#imported with the first session or html, never by importing the modules
+DEFERRED_MODULES = ('requests', 'urllib3', 'bs4', 'cryptography', 'inflection')
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+'''
+
+
+def time_import(module, deferred=DEFERRED_MODULES):
+    """Seconds to import module in a fresh interpreter, as matlab does, and the deferred modules loaded"""
+    script = IMPORT_SCRIPT.format(module=module, deferred=tuple(deferred))
+    output = subprocess.run([sys.executable, '-c', script], cwd=str(ROOT), check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the cold import time of the teamcenter modules')
+    parser.add_argument('modules', nargs='*', default=['teamcenter', 'teamcenter.tc_slreq'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='exit with an error when the best import time is above this')
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        results = [time_import(module) for _ in range(args.repeat)]
+        best = min(result["seconds"] for result in results)
+        loaded = results[0]["loaded"]
+        print('{:24} best {:.3f}s  deferred modules loaded: {}'.format(module, best, ', '.join(loaded) or 'none'))
+
+        if loaded or (args.max_seconds is not None and best > args.max_seconds):
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+    Benchmark of structuring requirement spec contents for matlab
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'bench_matlab_content.py'
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from teamcenter.tc_slreq import matlab_content
+
+
+def make_spec_contents(count, max_children=8, seed=0):
+    """Synthetic expandPSAllLevels result with count BOM lines below a spec"""
+    rnd = random.Random(seed)
+
+    spec = {"uid": "SPEC", "props": {}}
+    model_objects = {"SPEC": spec}
+    children = {"SPEC": []}
+    open_parents = ["SPEC"]
+
+    for i in range(count):
+        uid = "R{:07d}".format(i)
+        model_objects[uid] = {"uid": uid, "type": "Requirement Revision",
+            "props": {"object_string": {"uiValues": ["REQ-{0}/A;1-Requirement {0}".format(i)]}}}
+
+        parent = rnd.choice(open_parents)
+        children[parent].append({"itemRevOfBOMLine": {"uid": uid}})
+        children[uid] = []
+        open_parents.append(uid)
+        if len(children[parent]) >= max_children:
+            open_parents.remove(parent)
+
+    output = [{"parent": {"itemRevOfBOMLine": {"uid": uid}}, "children": kids}
+              for uid, kids in children.items()]
+    rnd.shuffle(output)
+
+    return spec, {"output": output, "ServiceData": {"modelObjects": model_objects}}
+
+
+def matlab_content_quadratic(tc_parent, tc_spec_contents, labels, depths, locations, depth=0):
+    """Previous recursive implementation, scanning the whole output per node"""
+    children = []
+    for structure in tc_spec_contents["output"]:
+        if not structure["parent"]: continue
+
+        if structure["parent"]["itemRevOfBOMLine"]["uid"] == tc_parent["uid"]:
+            children = structure["children"]
+            break
+
+    for child in children:
+        tc_req = tc_spec_contents["ServiceData"]["modelObjects"][child["itemRevOfBOMLine"]["uid"]]
+        part = tc_req["props"]["object_string"]["uiValues"][0].split(';')[0]
+        labels.append(tc_req["props"]["object_string"]["uiValues"][0].split(';')[-1].split('-',1)[-1])
+        locations.append(part.split('/')[0] + "_" + part.split('/')[-1])
+        depths.append(depth)
+
+        matlab_content_quadratic(tc_req, tc_spec_contents, labels, depths, locations, depth+1)
+
+
+def timed(fn, spec, contents):
+    labels, depths, locations = [], [], []
+    start = time.perf_counter()
+    fn(spec, contents, labels, depths, locations)
+    return time.perf_counter() - start, (labels, depths, locations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark matlab_content tree building')
+    parser.add_argument('--lines', type=int, default=50000, help='synthetic BOM lines')
+    parser.add_argument('--compare', type=int, metavar='LINES',
+                        help='also time the quadratic implementation on LINES lines, a few thousand: '
+                             'it takes minutes from about 20000')
+    args = parser.parse_args()
+
+    spec, contents = make_spec_contents(args.lines)
+
+    elapsed, result = timed(matlab_content, spec, contents)
+    print('indexed:   {} lines in {:.3f}s'.format(args.lines, elapsed))
+
+    if args.compare:
+        spec, contents = make_spec_contents(args.compare)
+        elapsed, result = timed(matlab_content, spec, contents)
+
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), args.compare + 100))
+        q_elapsed, q_result = timed(matlab_content_quadratic, spec, contents)
+        print('indexed:   {} lines in {:.3f}s'.format(args.compare, elapsed))
+        print('quadratic: {} lines in {:.3f}s ({:.0f}x)'.format(args.compare, q_elapsed, q_elapsed / elapsed))
+        assert q_result == result, 'implementations disagree'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+    Benchmark of the memory used by model objects of a structure expansion
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'bench_model_objects.py'
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from teamcenter import codec, datamodel
+from bench_codec import synthetic_payload
+
+
+def measure(data, compact):
+    gc.collect()
+    tracemalloc.start()
+
+    result = codec.get_codec().loads(data)
+    if compact:
+        datamodel.compact_response(result)
+
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size, len(result["ServiceData"]["modelObjects"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory of model objects as dicts and as ModelObject')
+    parser.add_argument('payloads', nargs='*', help='recorded JSON responses with ServiceData.modelObjects')
+    parser.add_argument('--lines', type=int, default=100000, help='synthetic BOM lines when no payloads are given')
+    args = parser.parse_args()
+
+    payloads = [(Path(path).name, Path(path).read_bytes()) for path in args.payloads] or [synthetic_payload(args.lines)]
+
+    for name, data in payloads:
+        dict_size, count = measure(data, compact=False)
+        compact_size, _ = measure(data, compact=True)
+        print('{:24} {} objects  dict {:.0f} B/object  ModelObject {:.0f} B/object ({:.0%})'.format(
+            name, count, dict_size / count, compact_size / count, compact_size / dict_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+    Benchmark of the tc_slreq functions against the fake Teamcenter server,
+    writing machine readable results for regression tracking
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'bench_slreq.py'
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+#the fake server is test support, not installed with the package
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'pytests'))
+
+from teamcenter import connection, speccache, tc_slreq
+from teamcenter.commands import get_command
+from fakeserver import FakeTcServer, FakeCredentials
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def requirement_objs(conn):
+    """Requirement revisions of the fake spec, as get_contents exports them"""
+    gifi = get_command('GetItemFromId')
+    gifi.set_cmd('SPEC-00001', 'A')
+    tc_spec = conn.handle(gifi)
+
+    tc_spec_contents = tc_slreq.expand_spec(conn, tc_spec)
+    return [o for o in tc_spec_contents["ServiceData"]["modelObjects"].values()
+            if "Requirement Revision" in o["type"]]
+
+
+def run_size(requirements, args):
+    """Times each function on a fake server with the given number of requirements"""
+    fake = FakeTcServer(requirements=requirements, depth=args.depth,
+                        images_per_requirement=args.images, latency=args.latency,
+                        name='BENCH{}'.format(requirements))
+    results = []
+
+    def record(benchmark, seconds, calls=1):
+        results.append({"benchmark": benchmark, "requirements": requirements, "calls": calls,
+                        "seconds": seconds, "requests": dict(fake.requests)})
+        fake.requests.clear()
+        print('{:>16} {:>8} reqs {:>6} calls {:9.3f}s'.format(benchmark, requirements, calls, seconds))
+
+    with fake:
+        conn = connection.TcConnection(fake.alias, FakeCredentials())
+        connection.config_alias(fake.alias)
+        try:
+            conn.login()
+            fake.requests.clear()
+
+            record('get_contents', timed(tc_slreq.get_contents, fake.spec_str))
+
+            tc_objs = requirement_objs(conn)
+            fake.requests.clear()
+            record('cache_all_html', timed(tc_slreq.cache_all_html, conn, tc_objs))
+
+            locations = fake.requirement_strs()[:args.calls]
+            record('get_summary', timed(lambda: [tc_slreq.get_summary(fake.spec_str, location)
+                                                 for location in locations]), len(locations))
+
+            record('insert_backlinks', timed(lambda: [tc_slreq.insert_backlinks(location, 'bench_model.slx',
+                                                                                'link {}'.format(i), 'open_system')
+                                                      for i, location in enumerate(locations)]), len(locations))
+        finally:
+            connection.close_connections()
+            connection.close_pools()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tc_slreq against a fake Teamcenter server')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000], help='requirements per specification')
+    parser.add_argument('--depth', type=int, default=4, help='levels of the specification structure')
+    parser.add_argument('--images', type=int, default=1, help='fms images per requirement')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--calls', type=int, default=100, help='get_summary and insert_backlinks calls')
+    parser.add_argument('--output', default='bench_slreq.json', help='results file')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_slreq')
+    speccache.set_cache_dir(cache_dir)
+    speccache.set_image_dir(cache_dir)
+
+    results = []
+    for requirements in args.sizes:
+        results.extend(run_size(requirements, args))
+
+    report = {
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": vars(args),
+        "results": results,
+    }
+    with open(args.output, 'w') as fp:
+        json.dump(report, fp, indent=2)
+
+    print('results written to {}'.format(args.output))
+
+
+if __name__ == '__main__':
+    main()
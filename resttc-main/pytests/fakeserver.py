@@ -0,0 +1,440 @@
+"""
+    In-process stand-in for a Teamcenter JSON REST server, for tests and benchmarks
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'fakeserver.py'
+
+import html
+import json
+import math
+import socket
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from teamcenter.alias import TcAlias
+
+BASE_PATH = '/tc/JsonRestServices/'
+FMS_PATH = '/fms/fmsdownload/'
+
+LAST_MOD_DATE = '2022-06-01T12:00:00+00:00'
+DEFAULT_PROPS = ('object_string', 'object_name', 'object_desc', 'last_mod_date')
+REVISION_RULES = ('Latest Working', 'Any Status; Working', 'Latest Released', 'Precise Only')
+
+INVALID_USER_QNAME = 'http://teamcenter.com/Schemas/Soa/2006-03/Exceptions.InvalidUserException'
+
+#smallest valid png, served for every fms download
+PNG = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                    '1f15c4890000000d4944415478da6364f8ffbf1e000502027f7cc2a8b300'
+                    '00000049454e44ae426082')
+
+class FakeCredentials(object):
+    '''Credentials accepted by the fake server'''
+    username = 'fake'
+    password = 'fake'
+
+class FakeTcServer(object):
+    '''
+    Serves the endpoints of services.API_ENDPOINTS, the fms downloads and the
+    Active Workspace page from memory, over http on localhost.
+
+    A synthetic specification SPEC-00001/A is generated with requirements
+    REQ-0000001/A ... in a tree of at most depth levels, each with
+    images_per_requirement fms images in its html. Every request waits latency
+    seconds before it is answered, and requests are counted by operation.
+    '''
+    def __init__(self, requirements=100, depth=4, images_per_requirement=0, latency=0.0,
+                 words_per_requirement=50, name='FAKE'):
+        self.name = name
+        self.requirements = requirements
+        self.latency = latency
+        self.images_per_requirement = images_per_requirement
+        self.words_per_requirement = words_per_requirement
+
+        self.requests = {}
+        #objects exported to html
+        self.exported = 0
+        self.sessions = set()
+        self._lock = threading.Lock()
+        self._objects = {}
+        self._items = {}
+        self._children = {}
+        self._related = {}
+        self._httpd = None
+        self._thread = None
+
+        self._generate(requirements, depth)
+
+    def _add_object(self, uid, obj_type, item_id, rev_id, name, desc=''):
+        self._objects[uid] = {
+            "uid": uid,
+            "className": obj_type.replace(' ', ''),
+            "type": obj_type,
+            "props": {
+                "object_string": "{}/{};1-{}".format(item_id, rev_id, name),
+                "object_name": name,
+                "object_desc": desc,
+                "last_mod_date": LAST_MOD_DATE,
+            }
+        }
+        if item_id is not None:
+            self._items.setdefault(item_id, {})[rev_id] = uid
+        self._children[uid] = []
+
+    def _generate(self, requirements, depth):
+        self.spec_uid = 'SPEC'
+        self._add_object(self.spec_uid, 'RequirementSpec Revision', 'SPEC-00001', 'A',
+                         'Synthetic Specification', 'Generated specification')
+
+        #breadth first, each parent having fanout children
+        fanout = max(2, math.ceil(requirements ** (1.0 / max(depth, 1)))) if requirements else 2
+        uids = [self.spec_uid]
+        for i in range(1, requirements + 1):
+            uid = 'R{:07d}'.format(i)
+            self._add_object(uid, 'Requirement Revision', 'REQ-{:07d}'.format(i), 'A',
+                             'Requirement {}'.format(i), 'Requirement {} description'.format(i))
+            self._children[uids[(i - 1) // fanout]].append(uid)
+            uids.append(uid)
+
+        for i, name in enumerate(REVISION_RULES):
+            uid = 'RULE{}'.format(i)
+            self._objects[uid] = {"uid": uid, "className": "RevisionRule", "type": "RevisionRule",
+                                  "props": {"object_name": name}}
+
+    @property
+    def spec_str(self):
+        return 'SPEC-00001_A'
+
+    def requirement_strs(self):
+        return ['REQ-{:07d}_A'.format(i) for i in range(1, self.requirements + 1)]
+
+    def touch(self, uid, last_mod_date=None):
+        '''Changes last_mod_date of an object, as if modified'''
+        with self._lock:
+            self._objects[uid]["props"]["last_mod_date"] = last_mod_date or time.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+    def add_requirement(self, parent_uid=None):
+        '''Adds a requirement under parent_uid (default the spec) without touching it, returns its ID_REV'''
+        with self._lock:
+            self.requirements += 1
+            i = self.requirements
+            uid = 'R{:07d}'.format(i)
+            self._add_object(uid, 'Requirement Revision', 'REQ-{:07d}'.format(i), 'A',
+                             'Requirement {}'.format(i), 'Requirement {} description'.format(i))
+            self._children[parent_uid or self.spec_uid].append(uid)
+
+        return 'REQ-{:07d}_A'.format(i)
+
+    def edit(self, uid, desc):
+        '''Changes object_desc of an object, its html text, and touches it'''
+        with self._lock:
+            self._objects[uid]["props"]["object_desc"] = desc
+        self.touch(uid)
+
+    def expire_sessions(self):
+        with self._lock:
+            self.sessions.clear()
+
+    #server
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    @property
+    def alias(self):
+        port = str(self.port)
+        return TcAlias(self.name, scheme='http', host='127.0.0.1', port=port, fmsport=port,
+                       awpath='', basepath=BASE_PATH)
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeTcHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='tc-fake-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, operation):
+        with self._lock:
+            self.requests[operation] = self.requests.get(operation, 0) + 1
+
+    #model objects
+
+    def ref(self, uid):
+        obj = self._objects[uid]
+        return {"uid": uid, "className": obj["className"], "type": obj["type"]}
+
+    def model_object(self, uid, props=DEFAULT_PROPS):
+        obj = self._objects[uid]
+        model_obj = self.ref(uid)
+        model_obj["props"] = dict((name, {"dbValues": [obj["props"][name]], "uiValues": [obj["props"][name]]})
+                                  for name in props if name in obj["props"])
+        return model_obj
+
+    def model_objects(self, uids, props=DEFAULT_PROPS):
+        return dict((uid, self.model_object(uid, props)) for uid in uids if uid in self._objects)
+
+    @staticmethod
+    def policy_props(request):
+        '''The properties of the policy of the request, the default ones without a policy'''
+        policy = request.get("header", {}).get("policy")
+        if not policy:
+            return DEFAULT_PROPS
+        return tuple(prop["name"] for policy_type in policy["types"] for prop in policy_type["properties"])
+
+    def html_of(self, uid, base_url):
+        obj = self._objects[uid]
+        words = ' '.join('word{}'.format(i) for i in range(self.words_per_requirement))
+        #each export has its own FMS tickets, as a server issues them
+        images = ''.join('<img src="{}{}_{}.png?ticket={}"/>'.format(base_url, uid, i, uuid.uuid4().hex)
+                         for i in range(self.images_per_requirement))
+        return html.escape('<div class="aw-requirement-header">{}</div><p>{} {}</p>{}'.format(
+            obj["props"]["object_string"], obj["props"]["object_desc"], words, images))
+
+    def new_object(self, obj_type, name, desc=''):
+        with self._lock:
+            uid = 'N' + uuid.uuid4().hex[:13]
+            self._add_object(uid, obj_type, None if obj_type != 'ItemRevision' else 'MODEL-' + uid, 'A', name, desc)
+            self._objects[uid]["props"]["object_string"] = name
+            return uid
+
+    #operations, by operation name of the endpoint
+
+    def login(self, request, session):
+        return {"serverInfo": {"Version": "fake", "HostName": "127.0.0.1"}}
+
+    def logout(self, request, session):
+        with self._lock:
+            self.sessions.discard(session)
+        return {}
+
+    def get_tc_session_info(self, request, session):
+        return {"serverVersion": "fake", "extraInfo": {}}
+
+    def get_item_from_id(self, request, session):
+        props = self.policy_props(request)
+        output, errors, uids = [], [], []
+        for i, info in enumerate(request["body"]["infos"]):
+            uid = self._items.get(info["itemId"], {}).get(info["revIds"][0] if info["revIds"] else None)
+            if uid is None:
+                errors.append({"clientIndex": i, "errorValues": [{"code": 214106, "level": 3,
+                               "message": "No item found for {}".format(info["itemId"])}]})
+                continue
+            output.append({"item": {"uid": 'I' + uid, "type": "Item"},
+                           "itemRevOutput": [{"itemRevision": self.ref(uid), "datasetOutput": []}]})
+            uids.append(uid)
+
+        service_data = {"modelObjects": self.model_objects(uids, props)}
+        if errors:
+            service_data["partialErrors"] = errors
+        return {"output": output, "ServiceData": service_data}
+
+    def load_objects(self, request, session):
+        uids = [uid for uid in request["body"]["uids"] if uid in self._objects]
+        return {"plain": uids, "modelObjects": self.model_objects(uids, self.policy_props(request))}
+
+    def get_properties(self, request, session):
+        uids = [obj["uid"] for obj in request["body"]["objects"] if obj["uid"] in self._objects]
+        return {"plain": uids, "modelObjects": self.model_objects(uids, request["body"]["attributes"])}
+
+    def get_revision_rules(self, request, session):
+        uids = [uid for uid, obj in self._objects.items() if obj["type"] == "RevisionRule"]
+        return {"output": [{"revRule": self.ref(uid), "overrideFolders": []} for uid in uids],
+                "ServiceData": {"modelObjects": self.model_objects(uids, ('object_name',))}}
+
+    def create_bom_windows(self, request, session):
+        info = request["body"]["info"][0]
+        uid = info["itemRev"]["uid"]
+        return {"output": [{"clientId": info["clientId"], "bomWindow": {"uid": "BW" + uid, "type": "BOMWindow"},
+                            "bomLine": {"uid": "BL" + uid, "type": "BOMLine"}}],
+                "ServiceData": {}}
+
+    def expand_ps_all_levels(self, request, session):
+        props = self.policy_props(request)
+        root = request["body"]["input"]["parentBomLines"][0]["uid"][2:]
+
+        output, uids, stack = [], [root], [root]
+        while stack:
+            uid = stack.pop()
+            children = self._children.get(uid, [])
+            output.append({"parent": {"bomLine": {"uid": "BL" + uid}, "itemRevOfBOMLine": self.ref(uid)},
+                           "children": [{"bomLine": {"uid": "BL" + child}, "itemRevOfBOMLine": self.ref(child)}
+                                        for child in children]})
+            uids.extend(children)
+            stack.extend(reversed(children))
+
+        return {"output": output, "ServiceData": {"modelObjects": self.model_objects(uids, props)}}
+
+    def export_to_application3(self, request, session):
+        export = request["body"]["input"][0]
+        base_url = export["exportOptions"][0]["optionvalue"]
+        with self._lock:
+            self.exported += len(export["objectsToExport"])
+        return {"transientFileReadTickets": [self.html_of(obj["uid"], base_url)
+                                             for obj in export["objectsToExport"]]}
+
+    def find_saved_queries(self, request, session):
+        names = request["body"]["inputCriteria"][0]["queryNames"]
+        return {"savedQueries": [{"uid": "Q" + name, "type": "ImanQuery"} for name in names]}
+
+    def describe_saved_queries(self, request, session):
+        return {"fieldLists": [{"query": query, "fields": []} for query in request["body"]["queries"]]}
+
+    def execute_saved_query(self, request, session):
+        criteria = dict(zip(request["body"]["entries"], request["body"]["values"]))
+        #types by display name, ex: Item Revision
+        found = [uid for uid, obj in self._objects.items()
+                 if obj["className"] == criteria.get("Type", obj["className"]).replace(' ', '')
+                 and obj["props"]["object_name"] == criteria.get("Name", obj["props"]["object_name"])]
+        found = found[:request["body"]["limit"] or None]
+        return {"nFound": len(found), "objects": [self.ref(uid) for uid in found]}
+
+    def create_attach_and_submit_objects(self, request, session):
+        create_data = request["body"]["inputs"][0]["createData"]
+        uid = self.new_object('ItemRevision', create_data["propertyNameValues"]["object_name"][0],
+                              create_data["propertyNameValues"]["object_desc"][0])
+        return {"output": [{"objects": [{"uid": 'I' + uid, "type": "Item"}, self.ref(uid)]}],
+                "ServiceData": {"created": ['I' + uid, uid]}}
+
+    def create_datasets2(self, request, session):
+        output = []
+        for dataset in request["body"]["input"]:
+            uid = self.new_object(dataset["type"], dataset["name"], dataset["description"])
+            with self._lock:
+                self._related.setdefault(dataset["container"]["uid"], []).append(uid)
+            output.append({"clientId": dataset["clientId"], "dataset": self.ref(uid)})
+        return {"output": output, "ServiceData": {"created": [o["dataset"]["uid"] for o in output]}}
+
+    def expand_grm_relations_for_primary(self, request, session):
+        uids = [uid for primary in request["body"]["primaryObjects"] for uid in self._related.get(primary["uid"], [])]
+        return {"output": [], "ServiceData": {"plain": uids, "modelObjects": self.model_objects(uids)}}
+
+    def create_tracelinks(self, request, session):
+        uid = 'TL' + uuid.uuid4().hex[:12]
+        return {"output": [{"clientId": "", "traceLinkObject": {"uid": uid, "type": "FND_TraceLink"}}]}
+
+OPERATIONS = {
+    'login': FakeTcServer.login,
+    'logout': FakeTcServer.logout,
+    'getTCSessionInfo': FakeTcServer.get_tc_session_info,
+    'findSavedQueries': FakeTcServer.find_saved_queries,
+    'describeSavedQueries': FakeTcServer.describe_saved_queries,
+    'executeSavedQuery': FakeTcServer.execute_saved_query,
+    'loadObjects': FakeTcServer.load_objects,
+    'getProperties': FakeTcServer.get_properties,
+    'getItemFromId': FakeTcServer.get_item_from_id,
+    'expandGRMRelationsForPrimary': FakeTcServer.expand_grm_relations_for_primary,
+    'createAttachAndSubmitObjects': FakeTcServer.create_attach_and_submit_objects,
+    'createDatasets2': FakeTcServer.create_datasets2,
+    'createBOMWindows': FakeTcServer.create_bom_windows,
+    'expandPSAllLevels': FakeTcServer.expand_ps_all_levels,
+    'getRevisionRules': FakeTcServer.get_revision_rules,
+    'exportToApplication3': FakeTcServer.export_to_application3,
+    'createTracelinks': FakeTcServer.create_tracelinks,
+}
+
+class FakeTcHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        #headers and body are written apart, do not wait for acks in between
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, content_type='application/json', cookies=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for cookie in cookies:
+            self.send_header('Set-Cookie', cookie)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _session(self):
+        for cookie in self.headers.get_all('Cookie', []):
+            for part in cookie.split(';'):
+                name, _, value = part.strip().partition('=')
+                if name == 'JSESSIONID':
+                    return value
+        return None
+
+    def do_GET(self):
+        fake = self.server.fake
+        path = urllib.parse.urlsplit(self.path).path
+        time.sleep(fake.latency)
+
+        if path.startswith(FMS_PATH):
+            fake.count('fmsdownload')
+            self._reply(200, PNG, 'image/png')
+        else:
+            fake.count('page')
+            self._reply(200, b'<html><body>Active Workspace</body></html>', 'text/html',
+                        cookies=['XSRF-TOKEN={}; Path=/'.format(uuid.uuid4().hex)])
+
+    def do_POST(self):
+        fake = self.server.fake
+        path = urllib.parse.urlsplit(self.path).path
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        time.sleep(fake.latency)
+
+        operation = OPERATIONS.get(path.rsplit('/', 1)[-1]) if path.startswith(BASE_PATH) else None
+        if operation is None:
+            self._reply(404, b'{}')
+            return
+
+        fake.count(path.rsplit('/', 1)[-1])
+
+        cookies = []
+        session = self._session()
+        if operation is FakeTcServer.login:
+            session = uuid.uuid4().hex
+            with fake._lock:
+                fake.sessions.add(session)
+            cookies.append('JSESSIONID={}; Path=/'.format(session))
+        elif session not in fake.sessions:
+            self._reply(200, json.dumps({".QName": INVALID_USER_QNAME, "code": 515024,
+                                         "message": "The session is not valid."}).encode('utf-8'))
+            return
+
+        self._reply(200, json.dumps(operation(fake, request, session)).encode('utf-8'), cookies=cookies)
@@ -0,0 +1,99 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_async_connection.py'
+
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import TestCase
+
+from teamcenter import async_connection, connection
+from teamcenter.metrics import get_metrics
+
+class MockAlias(object):
+    name = 'MOCK'
+
+class MockCmd(object):
+    def __init__(self, value):
+        self.value = value
+
+IN_USE = set()
+IN_USE_LOCK = threading.Lock()
+def mock_handle(conn, cmd):
+    with IN_USE_LOCK:
+        if conn in IN_USE:
+            raise AssertionError('session shared by commands in flight')
+        IN_USE.add(conn)
+    try:
+        time.sleep(0.01)
+        return (cmd.value, threading.current_thread().name, conn)
+    finally:
+        with IN_USE_LOCK:
+            IN_USE.discard(conn)
+
+LOGINS = []
+def mock_login(conn, resume=None):
+    LOGINS.append(conn)
+    conn.logged_in = True
+
+def mock_logout(conn):
+    conn.logged_in = False
+
+class TestAsyncConnection(TestCase):
+
+    def setUp(self):
+        self.original_login = connection.TcSession.login
+        self.original_logout = connection.TcSession.logout
+        connection.TcSession.login = mock_login
+        connection.TcSession.logout = mock_logout
+        connection.HANDLERS[MockCmd] = mock_handle
+        del LOGINS[:]
+        get_metrics('MOCK').clear()
+
+    def tearDown(self):
+        connection.TcSession.login = self.original_login
+        connection.TcSession.logout = self.original_logout
+        del connection.HANDLERS[MockCmd]
+
+    def test_handle(self):
+        async def run():
+            async with async_connection.AsyncTcConnection(MockAlias(), object(), max_size=3) as conn:
+                results = await asyncio.gather(*[conn.handle(MockCmd(i)) for i in range(10)])
+                self.assertEqual(conn.stats()['MockCmd'][None]['calls'], 10)
+                self.assertEqual(conn.pool.size, len(LOGINS))
+                return results
+
+        results = asyncio.run(run())
+        self.assertEqual([value for value, _, _ in results], list(range(10)))
+        self.assertTrue(all(name.startswith('tc-async') for _, name, _ in results))
+
+        #one session per slot, each logged in once and reused
+        self.assertLessEqual(len(LOGINS), 3)
+        self.assertEqual(set(session for _, _, session in results), set(LOGINS))
+        self.assertFalse(any(session.logged_in for session in LOGINS))
+    
+if __name__ == '__main__':
+    unittest.main()
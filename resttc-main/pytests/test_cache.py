@@ -0,0 +1,211 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_cache.py'
+
+
+
+import threading
+import unittest
+from unittest import TestCase
+
+from teamcenter import cache
+from teamcenter import codec
+from teamcenter import commands
+from teamcenter.datamodel import ObjectStore
+
+class TestFingerprint(TestCase):
+
+    def test_canonical(self):
+        dumps = codec.get_codec().dumps
+        self.assertEqual(cache.fingerprint('ep', dumps({"a": 1, "b": [1, 2]}, sort_keys=True)),
+                         cache.fingerprint('ep', dumps({"b": [1, 2], "a": 1}, sort_keys=True)))
+        self.assertNotEqual(cache.fingerprint('ep', dumps({"a": 1}, sort_keys=True)),
+                            cache.fingerprint('other', dumps({"a": 1}, sort_keys=True)))
+
+class TestSingleFlight(TestCase):
+
+    def test_coalesce(self):
+        single_flight = cache.SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            release.wait(5)
+            return {"value": 1}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(single_flight.do('key', slow_call)))
+                   for _ in range(6)]
+        for thread in threads: thread.start()
+        while single_flight.shared < 5: release.wait(0.001)
+        release.set()
+        for thread in threads: thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(single_flight.in_flight(), 0)
+
+    def test_exception(self):
+        single_flight = cache.SingleFlight()
+
+        def failing_call():
+            raise ValueError('failed')
+
+        self.assertRaises(ValueError, single_flight.do, 'key', failing_call)
+        self.assertEqual(single_flight.do('key', lambda: 2), 2)
+
+    def test_retry(self):
+        single_flight = cache.SingleFlight()
+        release = threading.Event()
+
+        def expired_call():
+            release.wait(5)
+            raise commands.InvalidSessionException('expired')
+
+        leader = threading.Thread(target=lambda: self.assertRaises(
+            commands.InvalidSessionException, single_flight.do, 'key', expired_call,
+            retry=(commands.InvalidSessionException,)))
+        leader.start()
+        while single_flight.in_flight() == 0: release.wait(0.001)
+
+        follower = []
+        thread = threading.Thread(target=lambda: follower.append(single_flight.do(
+            'key', lambda: 2, retry=(commands.InvalidSessionException,))))
+        thread.start()
+        while single_flight.shared == 0: release.wait(0.001)
+        release.set()
+        leader.join()
+        thread.join()
+
+        #the follower made its own call rather than getting the leader's expiry
+        self.assertEqual(follower, [2])
+
+class TestResponseCache(TestCase):
+
+    def setUp(self):
+        self.response_cache = cache.ResponseCache({'op': cache.CacheRule(60, 2)})
+
+    def test_get_put(self):
+        self.assertEqual(self.response_cache.get('op', 'a'), (False, None))
+        self.response_cache.put('op', 'a', {"value": 1})
+        self.response_cache.put('other', 'a', {"value": 2})
+
+        self.assertEqual(self.response_cache.get('op', 'a'), (True, {"value": 1}))
+        self.assertEqual(self.response_cache.get('other', 'a'), (False, None))
+        self.assertEqual(self.response_cache.stats()['op'], {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_lru(self):
+        self.response_cache.put('op', 'a', 1)
+        self.response_cache.put('op', 'b', 2)
+        self.response_cache.get('op', 'a')
+        self.response_cache.put('op', 'c', 3)
+
+        self.assertEqual(self.response_cache.get('op', 'a'), (True, 1))
+        self.assertEqual(self.response_cache.get('op', 'b'), (False, None))
+
+    def test_ttl(self):
+        self.response_cache.rules['op'] = cache.CacheRule(-1)
+        self.response_cache.put('op', 'a', 1)
+
+        self.assertEqual(self.response_cache.get('op', 'a'), (False, None))
+        self.assertEqual(self.response_cache.stats()['op']['entries'], 0)
+
+    def test_invalidate(self):
+        self.response_cache.put('op', 'a', 1)
+        self.response_cache.invalidate('op')
+
+        self.assertEqual(self.response_cache.get('op', 'a'), (False, None))
+
+class MockResponse(object):
+    content = b'{"rules": []}'
+
+class MockReadConn(object):
+    property_policy = None
+
+    def __init__(self):
+        self.single_flight = cache.SingleFlight()
+        self.response_cache = cache.ResponseCache()
+        self.object_store = ObjectStore()
+        self.posts = 0
+
+    def record_response_bytes(self, endpoint, with_policy, size): pass
+
+class MockGetRevisionRule(commands.GetRevisionRule):
+
+    def _post(self, conn, endpoint, stream=False, encoded=None):
+        conn.posts += 1
+        return MockResponse()
+
+class MockGetTCSessionInfo(commands.GetTCSessionInfo):
+
+    def _post(self, conn, endpoint, stream=False, encoded=None):
+        conn.posts += 1
+        return MockResponse()
+
+class TestReadOnlyCommands(TestCase):
+
+    def test_read_only(self):
+        self.assertTrue(commands.GetRevisionRule.READ_ONLY)
+        self.assertFalse(commands.CreateItem.READ_ONLY)
+        self.assertFalse(commands.GetHTML.READ_ONLY)
+
+    def test_send_to_single_flight(self):
+        conn = MockReadConn()
+        cmd = MockGetRevisionRule()
+        cmd.set_cmd('Latest Working')
+
+        self.assertEqual(cmd._send_to(conn, 'ep'), {"rules": []})
+        self.assertEqual(conn.posts, 1)
+        self.assertEqual(conn.single_flight.calls, 1)
+
+    def test_send_to_session_scoped(self):
+        conn = MockReadConn()
+        conn.response_cache = cache.ResponseCache({'getTCSessionInfo': cache.CacheRule(60)})
+        for _ in range(2):
+            cmd = MockGetTCSessionInfo()
+            cmd.set_cmd()
+            cmd._send_to(conn, 'http://tc/Core-2007-01-Session/getTCSessionInfo')
+
+        self.assertEqual(conn.posts, 2)
+        self.assertEqual(conn.single_flight.calls, 0)
+
+    def test_send_to_cached(self):
+        conn = MockReadConn()
+        conn.response_cache = cache.ResponseCache({'getRevisionRules': cache.CacheRule(60)})
+        for _ in range(3):
+            cmd = MockGetRevisionRule()
+            cmd.set_cmd('Latest Working')
+            cmd._send_to(conn, 'http://tc/Cad-2007-01-StructureManagement/getRevisionRules')
+
+        self.assertEqual(conn.posts, 1)
+        self.assertEqual(conn.response_cache.stats()['getRevisionRules']['hits'], 2)
+
+        conn.response_cache.invalidate()
+        cmd._send_to(conn, 'http://tc/Cad-2007-01-StructureManagement/getRevisionRules')
+        self.assertEqual(conn.posts, 2)
+
+if __name__ == '__main__':
+    unittest.main()
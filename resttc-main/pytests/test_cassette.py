@@ -0,0 +1,156 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_cassette.py'
+
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+import requests
+
+from teamcenter import cassette, connection, speccache, tc_slreq
+from teamcenter.commands import get_command
+from fakeserver import FakeTcServer, FakeCredentials
+
+class TestRequestKey(TestCase):
+
+    def test_scrubbed(self):
+        login = b'{"body":{"credentials":{"user":"a","password":"secret","descrimator":"PYTHON-1"}}}'
+        other = b'{"body":{"credentials":{"user":"b","password":"other","descrimator":"PYTHON-2"}}}'
+
+        self.assertEqual(cassette.request_key('POST', 'http://tc:3000/tc/login', login),
+                         cassette.request_key('POST', 'http://other/tc/login', other))
+        self.assertNotIn('secret', cassette.request_key('POST', 'http://tc/tc/login', login)[2])
+
+    def test_canonical(self):
+        self.assertEqual(cassette.request_key('POST', '/ep', b'{"a":1,"b":2}'),
+                         cassette.request_key('POST', '/ep', b'{"b":2,"a":1}'))
+
+    def test_query(self):
+        first = cassette.request_key('GET', 'http://tc:4544/fms/fmsdownload/a.png?ticket=1&x=2', None)
+
+        self.assertEqual(first, cassette.request_key('GET', 'http://tc:4544/fms/fmsdownload/a.png?x=2&ticket=1', None))
+        self.assertNotEqual(first, cassette.request_key('GET', 'http://tc:4544/fms/fmsdownload/a.png?ticket=3&x=2', None))
+
+class TestAnonymizer(TestCase):
+
+    def test_anonymize(self):
+        anonymizer = cassette.Anonymizer()
+        response = anonymizer.anonymize({"plain": ["abcDEF123"],
+                                         "modelObjects": {"abcDEF123": {"uid": "abcDEF123", "type": "Item"}}})
+        request = anonymizer.anonymize({"objects": [{"uid": "abcDEF123"}]})
+
+        self.assertEqual(response, {"plain": ["U0000000000001"],
+                                    "modelObjects": {"U0000000000001": {"uid": "U0000000000001", "type": "Item"}}})
+        self.assertEqual(request, {"objects": [{"uid": "U0000000000001"}]})
+
+class TestCassette(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_record_load(self):
+        path = os.path.join(self.temp_dir, 'cassette.jsonl.gz')
+        recorded = cassette.Cassette(path)
+        recorded.record('POST', 'http://tc/tc/ep', b'{"body":{}}', 200, 'application/json', b'{"value":1}')
+        recorded.record('GET', 'http://tc:4544/fms/fmsdownload/a.png', None, 200, 'image/png', b'\x89PNG')
+        recorded.close()
+
+        loaded = cassette.Cassette.load(path)
+        self.assertTrue(loaded.compress)
+        self.assertEqual(len(loaded.interactions), 2)
+        self.assertEqual(cassette.Cassette.body_of(loaded.interactions[0]), b'{"value":1}')
+        self.assertEqual(cassette.Cassette.body_of(loaded.interactions[1]), b'\x89PNG')
+
+    def test_replay_query(self):
+        recorded = cassette.Cassette(os.path.join(self.temp_dir, 'cassette.jsonl'))
+        recorded.record('GET', 'http://tc:4544/fms/fmsdownload/a.png?ticket=1', None, 200, 'image/png', b'first')
+        recorded.record('GET', 'http://tc:4544/fms/fmsdownload/a.png?ticket=2', None, 200, 'image/png', b'second')
+        recorded.close()
+
+        adapter = cassette.ReplayAdapter(cassette.Cassette.load(recorded.path))
+        for ticket, content in (('2', b'second'), ('1', b'first'), ('2', b'second')):
+            request = requests.Request('GET', 'http://tc:4544/fms/fmsdownload/a.png?ticket=' + ticket).prepare()
+            self.assertEqual(adapter.send(request).content, content)
+
+class TestRecordReplay(TestCase):
+
+    def setUp(self):
+        self.original_alias = connection.get_configured_alias()
+        self.original_cache_dir = speccache.CACHE_DIR
+        self.original_image_dir = speccache.IMAGE_DIR
+        self.temp_dir = tempfile.mkdtemp()
+        speccache.set_cache_dir(self.temp_dir)
+        speccache.set_image_dir(self.temp_dir)
+
+    def tearDown(self):
+        connection.stop_cassette()
+        connection.close_connections()
+        connection.close_pools()
+        connection.config_alias(self.original_alias)
+        speccache.CACHE_DIR = self.original_cache_dir
+        speccache.IMAGE_DIR = self.original_image_dir
+        speccache.SPEC_CACHE = None
+        shutil.rmtree(self.temp_dir)
+
+    def reset_alias(self, alias):
+        '''forgets what the process knows of the alias, as a new process would'''
+        connection.close_connections()
+        connection.close_pools()
+        connection.get_object_store(alias.name).clear()
+        connection.get_response_cache(alias.name).invalidate()
+        connection.get_revision_rule_index(alias.name).invalidate()
+        get_command('GetHTML').html_cache(alias.name).clear()
+
+    def test_record_replay(self):
+        path = os.path.join(self.temp_dir, 'contents.jsonl.gz')
+
+        with FakeTcServer(requirements=25, depth=3, images_per_requirement=1, name='FAKE_CASSETTE') as fake:
+            alias = fake.alias
+            self.reset_alias(alias)
+            connection.record_to(path, anonymize=True)
+            connection.TcConnection(alias, FakeCredentials())
+            connection.config_alias(alias)
+
+            recorded = tc_slreq.get_contents(fake.spec_str)
+            connection.stop_cassette()
+            self.reset_alias(alias)
+
+        #the server is stopped, answers come from the cassette
+        connection.replay_from(path)
+        connection.TcConnection(alias, cassette.ReplayCredentials())
+
+        self.assertEqual(tc_slreq.get_contents('SPEC-00001_A'), recorded)
+        self.assertIn('Requirement 2 description', tc_slreq.get_viewable_html('SPEC-00001_A', 'REQ-0000002_A'))
+        self.assertRaises(cassette.CassetteMiss, tc_slreq.get_summary, 'SPEC-00001_A', 'REQ-0000099_A')
+
+if __name__ == '__main__':
+    unittest.main()
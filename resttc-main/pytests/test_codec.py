@@ -0,0 +1,96 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_codec.py'
+
+
+import io
+import sys
+import unittest
+from unittest import TestCase
+
+from teamcenter import codec
+
+PAYLOAD = {"output": [{"uid": "abc", "name": "Spec \u00e9"}], "ServiceData": {"plain": []}}
+
+class TestCodec(TestCase):
+
+    def test_codecs(self):
+        for name in codec.CODECS:
+            try:
+                c = codec.create_codec(name)
+            except ImportError:
+                continue
+
+            data = c.dumps(PAYLOAD)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(c.loads(data), PAYLOAD)
+
+    def test_iter_stream(self):
+        expected = [('output', None, PAYLOAD["output"][0])]
+        data = codec.JsonCodec().dumps(PAYLOAD)
+
+        self.assertEqual(list(codec.iter_stream(io.BytesIO(data), ('output',), ('ServiceData.modelObjects',))), expected)
+
+        #without ijson the document is decoded as a whole
+        original = sys.modules.get('ijson')
+        sys.modules['ijson'] = None
+        try:
+            self.assertEqual(list(codec.iter_stream(io.BytesIO(data), ('output',), ('ServiceData.modelObjects',))), expected)
+        finally:
+            if original is None:
+                del sys.modules['ijson']
+            else:
+                sys.modules['ijson'] = original
+
+    def test_iter_stream_fields(self):
+        exception = {".QName": "http://teamcenter.com/Schemas/Soa/2006-03/Exceptions.InvalidUserException",
+                     "code": 515024, "message": "Invalid session"}
+        data = codec.JsonCodec().dumps(exception)
+        expected = sorted((name, None, value) for name, value in exception.items())
+
+        self.assertEqual(sorted(codec.iter_stream(io.BytesIO(data), ('output',), fields=tuple(exception))), expected)
+
+        original = sys.modules.get('ijson')
+        sys.modules['ijson'] = None
+        try:
+            self.assertEqual(sorted(codec.iter_stream(io.BytesIO(data), ('output',), fields=tuple(exception))), expected)
+        finally:
+            if original is None:
+                del sys.modules['ijson']
+            else:
+                sys.modules['ijson'] = original
+
+    def test_undefined(self):
+        self.assertRaises(codec.UndefinedCodec, codec.create_codec, 'foo')
+
+    def test_set_codec(self):
+        original = codec.get_codec()
+        try:
+            codec.set_codec('json')
+            self.assertEqual(codec.get_codec().name, 'json')
+        finally:
+            codec.CODEC = original
+    
+if __name__ == '__main__':
+    unittest.main()
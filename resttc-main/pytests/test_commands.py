@@ -29,6 +29,33 @@ from unittest import TestCase
 
 from teamcenter import commands
 
+def mock_item_from_id_response(cmd_json):
+    #every item is found except ids starting with MISSING
+    output, partial_errors, model_objects = [], [], {}
+    for i, info in enumerate(cmd_json["body"]["infos"]):
+        if info["itemId"].startswith('MISSING'):
+            partial_errors.append({"clientIndex": i})
+            continue
+
+        uid = info["itemId"] + info["revIds"][0]
+        output.append({"item": {"uid": "I" + uid},
+                       "itemRevOutput": [{"itemRevision": {"uid": uid}}]})
+        model_objects[uid] = {"uid": uid, "props": {}}
+
+    return {"output": output,
+            "ServiceData": {"modelObjects": model_objects,
+                            "partialErrors": partial_errors}}
+
+class MockGetItemsFromIds(commands.GetItemsFromIds):
+    requests = 0
+
+    def _send_to(self, conn, endpoint):
+        self.requests += 1
+        return mock_item_from_id_response(self.cmd_json)
+
+class MockPolicyConn(object):
+    property_policy = commands.PropertyPolicy({"WorkspaceObject": ["object_string"]})
+
 class TestCommands(TestCase):
 
     def test_get_command(self):
@@ -40,6 +67,51 @@ class TestCommands(TestCase):
     def test_cmd_set(self):
         l = commands.get_command('Login')
         l.set_cmd('ed','ed')
+
+    def test_service_exception(self):
+        commands.check_service_exception({"output": []})
+        self.assertRaises(commands.InvalidSessionException, commands.check_service_exception,
+            {".QName": "http://teamcenter.com/Schemas/Soa/2006-03/Exceptions.InvalidUserException",
+             "code": 0, "message": "session expired"})
+        self.assertRaises(commands.TcServiceException, commands.check_service_exception,
+            {".QName": "http://teamcenter.com/Schemas/Soa/2006-03/Exceptions.ServiceException",
+             "message": "failed"})
+
+    def test_property_policy(self):
+        lo = commands.get_command('LoadObjects')
+        lo.set_cmd(['uid'])
+
+        cmd_json = lo.request_json(MockPolicyConn())
+        self.assertEqual(cmd_json["header"]["policy"],
+            {"types": [{"name": "WorkspaceObject", "properties": [{"name": "object_string"}]}]})
+        self.assertNotIn("policy", commands.TcCommand.DEFAULT_JSON_CMD["header"])
+
+        lo.set_property_policy(commands.PropertyPolicy({"Item": ["item_id"]}))
+        self.assertEqual(lo.request_json(MockPolicyConn())["header"]["policy"]["types"][0]["name"], "Item")
+
+    def test_get_items_from_ids(self):
+        gifis = MockGetItemsFromIds()
+        gifis.set_cmd(['REQ-1_A', 'MISSING-2_A', 'REQ-3_B'], chunk_size=2)
+
+        result = gifis.send_to(None, 'endpoint')
+
+        self.assertEqual(gifis.requests, 2)
+        self.assertEqual(result['REQ-1_A']['uid'], 'REQ-1A')
+        self.assertEqual(result['REQ-3_B']['uid'], 'REQ-3B')
+        self.assertIsNone(result['MISSING-2_A'])
+        self.assertEqual(gifis.missing, ['MISSING-2_A'])
+
+    def test_get_items_from_malformed_ids(self):
+        gifis = MockGetItemsFromIds()
+        gifis.set_cmd(['REQ-1_A', 'NOREV', 'REQ-2_', '_A', 'REQ-3_B'], chunk_size=2)
+
+        result = gifis.send_to(None, 'endpoint')
+
+        self.assertEqual(gifis.requests, 1)
+        self.assertEqual(result['REQ-1_A']['uid'], 'REQ-1A')
+        self.assertEqual(result['REQ-3_B']['uid'], 'REQ-3B')
+        self.assertEqual(gifis.missing, ['NOREV', 'REQ-2_', '_A'])
+        self.assertIsNone(result['NOREV'])
     
 if __name__ == '__main__':
     unittest.main()
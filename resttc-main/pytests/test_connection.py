@@ -25,6 +25,8 @@ __filename__ = 'test_connection.py'
 
 
 import copy
+import threading
+import time
 import unittest
 from unittest import TestCase
 
@@ -42,6 +44,24 @@ def mock_get_command(cmd_name):
 def mock_handle(conn, ednpoint):
 
     pass
+
+def mock_login(conn, resume=None):
+    conn.logged_in = True
+
+class MockAlias(object):
+    name = 'MOCK'
+
+class MockValueCmd(object):
+    def __init__(self, value):
+        self.value = value
+
+def mock_value_handle(conn, cmd):
+    if cmd.value is None:
+        raise ValueError('no value')
+    return cmd.value
+
+def mock_policy_handle(conn, cmd):
+    return conn.property_policy
     
 
 class TestConnection(TestCase):
@@ -58,6 +78,321 @@ class TestConnection(TestCase):
 
     def test_get_connection(self):
         pass #conn = connection.get_connection()
+
+class MockOtherAlias(object):
+    name = 'MOCK_OTHER'
+
+class TestAliasRegistry(TestCase):
+
+    def setUp(self):
+        self.original_login = connection.TcSession.login
+        connection.TcSession.login = mock_login
+
+    def tearDown(self):
+        connection.TcSession.login = self.original_login
+        connection.close_connections(logout=False)
+
+    def test_connection_per_alias(self):
+        conn = connection.TcConnection(MockAlias(), object())
+        other = connection.TcConnection(MockOtherAlias(), object())
+
+        self.assertIsNot(conn, other)
+        self.assertEqual(other.alias.name, 'MOCK_OTHER')
+        self.assertIsNot(conn.object_store, other.object_store)
+        self.assertIs(connection.TcConnection(MockAlias()), conn)
+
+    def test_get_connections(self):
+        connection.TcConnection(MockAlias(), object())
+        connection.TcConnection(MockOtherAlias(), object())
+        conn = connection.get_connection(MockAlias())
+        other = connection.get_connection(MockOtherAlias())
+
+        self.assertTrue(conn.logged_in and other.logged_in)
+        self.assertEqual(connection.get_connections(), {'MOCK': conn, 'MOCK_OTHER': other})
+
+class MockExpiringCmd(object):
+    pass
+
+def mock_expiring_handle(conn, cmd):
+    #the session of the first login expires
+    if conn._login_generation == 1:
+        time.sleep(0.01)
+        raise connection.InvalidSessionException('expired')
+    return conn._login_generation
+
+def mock_counting_login(conn, resume=None):
+    conn.logged_in = True
+    conn._login_generation += 1
+
+class TestRelogin(TestCase):
+
+    def setUp(self):
+        self.original_login = connection.TcSession.login
+        connection.TcSession.login = mock_counting_login
+        connection.HANDLERS[MockExpiringCmd] = mock_expiring_handle
+
+    def tearDown(self):
+        connection.TcSession.login = self.original_login
+        del connection.HANDLERS[MockExpiringCmd]
+
+    def test_relogin_once(self):
+        conn = connection.TcSession(MockAlias(), object())
+        conn.login()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(conn.handle(MockExpiringCmd())))
+                   for _ in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+        self.assertEqual(results, [2] * 8)
+        self.assertEqual(conn.relogins, 1)
+
+    def test_not_logged_in(self):
+        conn = connection.TcSession(MockAlias(), object())
+        conn._login_generation = 1
+        self.assertRaises(connection.InvalidSessionException, conn.handle, MockExpiringCmd())
+
+class MockSessionAlias(MockAlias):
+    def get_base_url(self):
+        return 'http://tc/tc'
+
+    def get_fms_url(self):
+        return 'http://tc:4544'
+
+class MockCredentials(object):
+    username = 'user'
+    password = 'password'
+
+class MockSessionInfoCmd(MockCmd):
+    valid = True
+
+def mock_session_info_handle(conn, cmd):
+    if not cmd.valid:
+        raise connection.InvalidSessionException('expired')
+    return {}
+
+class TestResumeSession(TestCase):
+
+    def setUp(self):
+        self.original_get = connection.get_command
+        self.original_load = connection.load_session
+        self.original_clear = connection.clear_session
+        connection.get_command = lambda cmd_name: MockSessionInfoCmd()
+        connection.HANDLERS[MockSessionInfoCmd] = mock_session_info_handle
+        connection.load_session = lambda alias: {
+            "url": 'http://tc/tc',
+            "cookies": [{"name": "JSESSIONID", "value": "abc", "domain": "tc",
+                         "path": "/", "secure": False, "expires": None}],
+            "headers": {"X-XSRF-TOKEN": "xyz"}}
+        self.cleared = []
+        connection.clear_session = self.cleared.append
+        self.original_save = connection.save_session
+        self.saved = []
+        connection.save_session = lambda alias, state: self.saved.append(alias)
+
+    def tearDown(self):
+        connection.get_command = self.original_get
+        connection.load_session = self.original_load
+        connection.clear_session = self.original_clear
+        connection.save_session = self.original_save
+        connection.enable_session_resume(False)
+        del connection.HANDLERS[MockSessionInfoCmd]
+        MockSessionInfoCmd.valid = True
+
+    def test_resume(self):
+        conn = connection.TcSession(MockSessionAlias(), object())
+
+        self.assertTrue(conn.resume_session())
+        self.assertEqual(conn.session.cookies['JSESSIONID'], 'abc')
+        self.assertEqual(conn.session.headers['X-XSRF-TOKEN'], 'xyz')
+
+    def test_resume_expired(self):
+        MockSessionInfoCmd.valid = False
+        conn = connection.TcSession(MockSessionAlias(), object())
+
+        self.assertFalse(conn.resume_session())
+        self.assertEqual(self.cleared, ['MOCK'])
+
+    def test_logout_saved(self):
+        conn = connection.TcSession(MockSessionAlias(), object())
+        conn.resume_session()
+
+        self.assertTrue(conn.owns_saved_session())
+        conn.logout()
+        self.assertEqual(self.cleared, ['MOCK'])
+
+    def test_logout_other(self):
+        conn = connection.TcSession(MockSessionAlias(), object())
+        conn.new_session()
+        conn.session.cookies.set('JSESSIONID', 'def', domain='tc', path='/')
+
+        self.assertFalse(conn.owns_saved_session())
+        conn.logout()
+        self.assertEqual(self.cleared, [])
+
+    def test_relogin_saves(self):
+        connection.enable_session_resume()
+        conn = connection.TcSession(MockSessionAlias(), MockCredentials())
+        conn.resume_session()
+
+        conn.relogin(conn._login_generation)
+        self.assertEqual(conn.relogins, 1)
+        self.assertEqual(self.saved, ['MOCK'])
+
+        other = connection.TcSession(MockSessionAlias(), MockCredentials())
+        other.new_session()
+        other.relogin(other._login_generation)
+        self.assertEqual(self.saved, ['MOCK'])
+
+class TestPolicyReport(TestCase):
+
+    def test_policy_report(self):
+        conn = connection.TcSession(MockAlias(), object())
+        conn.record_response_bytes('expand', False, 1000)
+        conn.record_response_bytes('expand', True, 300)
+        conn.record_response_bytes('expand', True, 100)
+        conn.record_response_bytes('login', False, 50)
+
+        report = conn.policy_report()
+        self.assertEqual(report['expand']['bytes_saved'], 1600)
+        self.assertEqual(report['expand']['policy_avg_bytes'], 200)
+        self.assertIsNone(report['login']['bytes_saved'])
+
+class TestConnectionPool(TestCase):
+
+    def setUp(self):
+        self.original_login = connection.TcSession.login
+        connection.TcSession.login = mock_login
+        self.pool = connection.TcConnectionPool(MockAlias(), credentials=object(), max_size=2)
+
+    def tearDown(self):
+        connection.TcSession.login = self.original_login
+        self.pool.close(logout=False)
+
+    def test_checkout_checkin(self):
+        with self.pool.connection() as conn:
+            self.assertTrue(conn.logged_in)
+            self.assertNotIsInstance(conn, connection.TcConnection)
+
+        with self.pool.connection() as again:
+            self.assertIs(conn, again)
+
+        self.assertEqual(self.pool.size, 1)
+
+    def test_max_size(self):
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        self.assertIsNot(first, second)
+        self.assertRaises(connection.PoolExhausted, self.pool.checkout, 0.01)
+
+        threading.Timer(0.05, self.pool.checkin, (first,)).start()
+        self.assertIs(self.pool.checkout(1), first)
+
+class TestHandleMany(TestCase):
+
+    def setUp(self):
+        self.original_login = connection.TcSession.login
+        connection.TcSession.login = mock_login
+        connection.HANDLERS[MockValueCmd] = mock_value_handle
+
+    def tearDown(self):
+        connection.TcSession.login = self.original_login
+        del connection.HANDLERS[MockValueCmd]
+        connection.close_pools()
+
+    def test_handle_many(self):
+        conn = connection.TcSession(MockAlias(), object())
+        cmds = [MockValueCmd(i) for i in range(20)] + [MockValueCmd(None)]
+
+        results = conn.handle_many(cmds, max_concurrency=3)
+
+        self.assertEqual(results[:-1], list(range(20)))
+        self.assertIsInstance(results[-1], ValueError)
+        self.assertLessEqual(connection.get_pool(MockAlias()).size, 3)
+
+    def test_pool_grows(self):
+        conn = connection.TcSession(MockAlias(), object())
+        conn.handle_many([MockValueCmd(i) for i in range(4)], max_concurrency=2)
+        self.assertEqual(connection.POOLS['MOCK'].max_size, 2)
+
+        conn.handle_many([MockValueCmd(i) for i in range(4)], max_concurrency=6)
+        self.assertEqual(connection.POOLS['MOCK'].max_size, 6)
+
+        connection.get_pool(MockAlias(), max_size=3)
+        self.assertEqual(connection.POOLS['MOCK'].max_size, 6)
+
+    def test_policy_per_call(self):
+        connection.HANDLERS[MockValueCmd] = mock_policy_handle
+        policy = object()
+        conn = connection.TcSession(MockAlias(), object())
+        conn.set_property_policy(policy)
+        cmds = [MockValueCmd(i) for i in range(4)]
+
+        self.assertEqual(conn.handle_many(cmds, max_concurrency=2), [policy] * 4)
+        self.assertTrue(all(not hasattr(cmd, 'property_policy') for cmd in cmds))
+
+        #pooled sessions are back to their own policy
+        with connection.get_pool(MockAlias()).connection() as pooled:
+            self.assertIsNone(pooled.property_policy)
+
+class TestWarmUp(TestCase):
+
+    def setUp(self):
+        self.original_login = connection.TcSession.login
+        self.original_logout = connection.TcSession.logout
+        self.original_timeout = connection.WARM_UP_TIMEOUT
+        self.release = threading.Event()
+        self.logouts = []
+
+        def blocking_login(conn, resume=None):
+            #the warm-up login hangs until released
+            if threading.current_thread().name.startswith('tc-warm-up'):
+                self.release.wait(5)
+            conn.session = object()
+            conn.logged_in = True
+
+        def mock_logout(conn):
+            self.logouts.append(conn)
+            conn.logged_in = False
+
+        connection.TcSession.login = blocking_login
+        connection.TcSession.logout = mock_logout
+        connection.WARM_UP_TIMEOUT = 0.05
+        connection.TcConnection(MockAlias(), object())
+
+    def tearDown(self):
+        self.release.set()
+        connection.WARM_UPS.clear()
+        connection.close_connections(logout=False)
+        connection.TcSession.login = self.original_login
+        connection.TcSession.logout = self.original_logout
+        connection.WARM_UP_TIMEOUT = self.original_timeout
+
+    def test_adopts_session(self):
+        self.release.set()
+        warming_up = connection.warm_up(MockAlias(), revision_rules=(), saved_queries=())
+
+        conn = connection.get_connection(MockAlias())
+        self.assertFalse(warming_up.running)
+        self.assertIsNone(warming_up.error)
+        self.assertTrue(conn.logged_in)
+        self.assertEqual(self.logouts, [])
+
+    def test_hung_warm_up(self):
+        warming_up = connection.warm_up(MockAlias(), revision_rules=(), saved_queries=())
+
+        #logs in itself once the wait is over
+        conn = connection.get_connection(MockAlias())
+        self.assertTrue(warming_up.running)
+        self.assertTrue(conn.logged_in)
+        session = conn.session
+
+        #the warm-up session is not adopted then, it logs out
+        self.release.set()
+        self.assertTrue(warming_up.wait(5))
+        self.assertIs(conn.session, session)
+        self.assertEqual(len(self.logouts), 1)
     
 if __name__ == '__main__':
     unittest.main()
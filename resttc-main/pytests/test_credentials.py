@@ -0,0 +1,74 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_credentials.py'
+
+
+
+import shutil
+import tempfile
+import unittest
+from pathlib import PurePath
+from unittest import TestCase
+
+from cryptography.fernet import Fernet
+
+from teamcenter import credentials
+
+class TestSessionFile(TestCase):
+
+    def setUp(self):
+        self.original_dir = credentials.CREDENTIAL_DIR
+        self.temp_dir = tempfile.mkdtemp()
+        credentials.CREDENTIAL_DIR = PurePath(self.temp_dir)
+        with open(str(PurePath(self.temp_dir, 'MOCK_key.key')), 'w') as key_out:
+            key_out.write(Fernet.generate_key().decode())
+
+    def tearDown(self):
+        credentials.CREDENTIAL_DIR = self.original_dir
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_load(self):
+        state = {"url": "http://tc", "cookies": [{"name": "JSESSIONID", "value": "abc"}], "headers": {}}
+        credentials.save_session('MOCK', state)
+
+        self.assertEqual(credentials.load_session('MOCK'), state)
+        with open(str(credentials.get_session_file('MOCK')), 'rb') as session_in:
+            self.assertNotIn(b'JSESSIONID', session_in.read())
+
+    def test_clear(self):
+        credentials.save_session('MOCK', {"url": "http://tc"})
+        credentials.clear_session('MOCK')
+        credentials.clear_session('MOCK')
+
+        self.assertIsNone(credentials.load_session('MOCK'))
+
+    def test_other_key(self):
+        credentials.save_session('MOCK', {"url": "http://tc"})
+        with open(str(PurePath(self.temp_dir, 'MOCK_key.key')), 'w') as key_out:
+            key_out.write(Fernet.generate_key().decode())
+
+        self.assertIsNone(credentials.load_session('MOCK'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_datamodel.py'
+
+
+import time
+import unittest
+from unittest import TestCase
+
+from teamcenter import datamodel
+
+def model_obj(uid, **props):
+    return {"uid": uid, "type": "Requirement Revision",
+            "props": dict((name, {"uiValues": [value]}) for name, value in props.items())}
+
+class TestModelObject(TestCase):
+
+    def test_dict_access(self):
+        raw = model_obj("a", object_string="REQ-1/A;Req")
+        raw["className"] = "Requirement"
+        raw["props"]["object_string"]["dbValues"] = ["REQ-1/A;Req"]
+        mo = datamodel.ModelObject(raw)
+
+        self.assertEqual(mo["props"]["object_string"]["uiValues"][0], "REQ-1/A;Req")
+        self.assertEqual(mo["type"], "Requirement Revision")
+        self.assertIn("props", mo)
+        self.assertNotIn("props", datamodel.ModelObject({"uid": "b"}))
+        self.assertEqual(mo.get("objectID", "none"), "none")
+        self.assertEqual(mo.to_json(), raw)
+        self.assertEqual(mo, raw)
+
+    def test_compact_response(self):
+        response = {"ServiceData": {"modelObjects": {"a": model_obj("a")}}}
+        datamodel.compact_response(response)
+        self.assertIsInstance(response["ServiceData"]["modelObjects"]["a"], datamodel.ModelObject)
+
+    def test_codec(self):
+        from teamcenter import codec
+        mo = datamodel.ModelObject(model_obj("a", object_string="REQ-1/A;Req"))
+        self.assertEqual(codec.get_codec().loads(codec.get_codec().dumps({"itemRev": mo})), {"itemRev": mo.to_json()})
+
+class TestObjectStore(TestCase):
+
+    def test_merge_props(self):
+        store = datamodel.ObjectStore()
+        store.ingest({"a": model_obj("a", object_string="REQ-1/A;Req")})
+        store.ingest_response({"ServiceData": {"modelObjects": {"a": model_obj("a", object_desc="Desc")}}})
+
+        self.assertIsNotNone(store.get("a", ["object_string", "object_desc"]))
+        self.assertIsNone(store.get("a", ["last_mod_date"]))
+        self.assertIsNone(store.get_many(["a", "b"]))
+
+    def test_max_age(self):
+        store = datamodel.ObjectStore(max_age=0.05)
+        store.ingest({"a": model_obj("a", object_string="REQ-1/A;Req")})
+        self.assertIsNotNone(store.get("a", ["object_string"]))
+
+        time.sleep(0.1)
+        self.assertIsNone(store.get("a", ["object_string"]))
+
+        #received again, fresh again
+        store.ingest({"a": model_obj("a", object_desc="Desc")})
+        self.assertIsNotNone(store.get("a", ["object_string", "object_desc"]))
+
+    def test_without_props(self):
+        store = datamodel.ObjectStore()
+        store.ingest({"a": {"uid": "a", "type": "Requirement Revision"}})
+
+        self.assertIsNotNone(store.get("a"))
+        self.assertIsNone(store.get("a", ["object_string"]))
+        self.assertIsNone(store.get_many(["a"], ["object_string"]))
+
+        store.ingest({"a": model_obj("a", object_string="REQ-1/A;Req")})
+        self.assertIsNotNone(store.get("a", ["object_string"]))
+
+    def test_lru_eviction(self):
+        store = datamodel.ObjectStore(max_size=2)
+        store.ingest({"a": model_obj("a"), "b": model_obj("b")})
+        store.get("a")
+        store.ingest({"c": model_obj("c")})
+
+        self.assertIn("a", store)
+        self.assertNotIn("b", store)
+        self.assertEqual(len(store), 2)
+
+    def test_per_alias(self):
+        self.assertIs(datamodel.get_object_store('DEV'), datamodel.get_object_store('DEV'))
+        self.assertIsNot(datamodel.get_object_store('DEV'), datamodel.get_object_store('PROD'))
+    
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_fakeserver.py'
+
+
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+
+from teamcenter import connection, speccache, tc_slreq
+from fakeserver import FakeTcServer, FakeCredentials
+
+class TestFakeServer(TestCase):
+    '''tc_slreq end to end against the fake server'''
+
+    def setUp(self):
+        self.original_alias = connection.get_configured_alias()
+        self.original_cache_dir = speccache.CACHE_DIR
+        self.original_image_dir = speccache.IMAGE_DIR
+        self.temp_dir = tempfile.mkdtemp()
+        speccache.set_cache_dir(self.temp_dir)
+        speccache.set_image_dir(self.temp_dir)
+
+        self.fake = FakeTcServer(requirements=40, depth=3, images_per_requirement=1,
+                                 name='FAKE_TEST').start()
+        self.conn = connection.TcConnection(self.fake.alias, FakeCredentials())
+        self.conn.response_cache.invalidate()
+        self.conn.object_store.clear()
+        connection.config_alias(self.fake.alias)
+
+    def tearDown(self):
+        connection.WARM_UPS.clear()
+        connection.close_connections()
+        connection.close_pools()
+        self.fake.stop()
+        connection.config_alias(self.original_alias)
+        speccache.CACHE_DIR = self.original_cache_dir
+        speccache.IMAGE_DIR = self.original_image_dir
+        speccache.SPEC_CACHE = None
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_contents(self):
+        labels, depths, locations = tc_slreq.get_contents(self.fake.spec_str)
+
+        self.assertEqual(len(locations), 40)
+        self.assertEqual(sorted(locations), self.fake.requirement_strs())
+        self.assertEqual(labels[0], 'Requirement 1')
+        self.assertEqual(max(depths), 2)
+        self.assertEqual(self.fake.requests['fmsdownload'], 40)
+
+        html = tc_slreq.get_viewable_html(self.fake.spec_str, locations[0])
+        self.assertIn('Requirement 1 description', html)
+        self.assertNotIn('aw-requirement-header', html)
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, 'specimages', locations[0], locations[0] + '_1.png')))
+
+    def test_get_summary(self):
+        self.assertEqual(tc_slreq.get_summary(self.fake.spec_str, 'REQ-0000002_A'), 'REQ-0000002/A;1-Requirement 2')
+        self.assertEqual(tc_slreq.get_summaries(self.fake.spec_str, ['REQ-0000003_A', 'REQ-0000099_A']),
+                         ['REQ-0000003/A;1-Requirement 3', None])
+
+    def test_insert_backlinks(self):
+        tc_slreq.insert_backlinks('REQ-0000001_A', '/models/model.slx', 'link', 'open_system')
+        tc_slreq.insert_backlinks('REQ-0000002_A', '/models/model.slx', 'link', 'open_system')
+
+        self.assertEqual(self.fake.requests['createAttachAndSubmitObjects'], 1)
+        self.assertEqual(self.fake.requests['createDatasets2'], 1)
+        self.assertEqual(self.fake.requests['createTracelinks'], 2)
+
+    def test_relogin(self):
+        tc_slreq.get_summary(self.fake.spec_str, 'REQ-0000001_A')
+        self.fake.expire_sessions()
+
+        self.assertEqual(tc_slreq.get_summary(self.fake.spec_str, 'REQ-0000002_A'), 'REQ-0000002/A;1-Requirement 2')
+        self.assertEqual(self.conn.relogins, 1)
+
+    def test_logout_expired(self):
+        connection.get_connection()
+        self.fake.expire_sessions()
+
+        connection.reset_connection()
+        self.assertFalse(self.conn.logged_in)
+        self.assertEqual(tc_slreq.get_summary(self.fake.spec_str, 'REQ-0000001_A'), 'REQ-0000001/A;1-Requirement 1')
+
+    def test_relogin_stream(self):
+        connection.get_connection()
+        gifi = connection.get_command('GetItemFromId')
+        gifi.set_cmd(*self.fake.spec_str.rsplit('_', 1))
+        tc_spec = self.conn.handle(gifi)
+        grr = connection.get_command('GetRevisionRule')
+        grr.set_cmd('Latest Working')
+        cbw = connection.get_command('CreateBOMWindow')
+        cbw.set_cmd(tc_spec, self.conn.handle(grr))
+        bom_window_line = self.conn.handle(cbw)
+
+        #the exception payload of the expired session is raised within handle
+        self.fake.expire_sessions()
+        expandall = connection.get_command('ExpandPSAllLevels')
+        expandall.set_cmd(bom_window_line, stream=True)
+        structure = tc_slreq.structure_of_stream(self.conn.handle(expandall))
+
+        self.assertEqual(self.conn.relogins, 1)
+        self.assertIn(tc_spec["uid"], structure["children"])
+        self.assertEqual(len(structure["objects"]), 41)
+
+    def test_relogin_cached_contents(self):
+        tc_slreq.get_summary(self.fake.spec_str, 'REQ-0000001_A')
+        self.fake.expire_sessions()
+
+        labels, depths, locations = tc_slreq.get_contents(self.fake.spec_str, use_cache=True)
+        self.assertEqual(len(locations), 40)
+        self.assertEqual(len(tc_slreq.get_contents(self.fake.spec_str, use_cache=True)[2]), 40)
+
+    def test_cached_contents_fresh(self):
+        tc_slreq.get_contents(self.fake.spec_str, use_cache=True, check_fresh=True)
+        self.fake.requests.clear()
+
+        tc_slreq.get_contents(self.fake.spec_str, use_cache=True, check_fresh=True)
+        self.assertNotIn('exportToApplication3', self.fake.requests)
+
+        #a requirement edited does not change the spec
+        self.fake.edit('R0000002', 'Edited description')
+        tc_slreq.get_contents(self.fake.spec_str, use_cache=True, check_fresh=True)
+        self.assertIn('exportToApplication3', self.fake.requests)
+        self.assertIn('Edited description', tc_slreq.get_viewable_html(self.fake.spec_str, 'REQ-0000002_A'))
+
+    def test_cached_structure_changed(self):
+        for incremental in (False, True):
+            tc_slreq.get_contents(self.fake.spec_str, use_cache=True, incremental=incremental)
+            added = self.fake.add_requirement()
+            self.fake.exported = 0
+
+            labels, depths, locations = tc_slreq.get_contents(self.fake.spec_str, use_cache=True, incremental=incremental)
+            self.assertIn(added, locations)
+            self.assertEqual(sorted(locations), self.fake.requirement_strs())
+            self.assertEqual(self.fake.exported, 1 if incremental else len(locations))
+
+    def test_object_store_fresh(self):
+        conn = connection.get_connection()
+        lo = connection.get_command('LoadObjects')
+        lo.set_cmd(['R0000001'], props=['object_desc'])
+        lo.set_property_policy(tc_slreq.CONTENTS_POLICY)
+        conn.handle(lo)
+
+        #properties are always asked to the server
+        self.fake.edit('R0000001', 'Edited description')
+        self.fake.requests.clear()
+        current = tc_slreq.get_properties(conn, [{"uid": 'R0000001', "type": 'Requirement Revision'}], ['last_mod_date'])
+        self.assertEqual(self.fake.requests['getProperties'], 1)
+        self.assertNotEqual(tc_slreq.last_mod_date_of(current['R0000001']), '2022-06-01T12:00:00+00:00')
+
+        #loaded objects answer from the store only while fresh
+        original_max_age = conn.object_store.max_age
+        self.addCleanup(setattr, conn.object_store, 'max_age', original_max_age)
+        conn.object_store.max_age = 0.05
+        time.sleep(0.1)
+        conn.response_cache.invalidate()
+
+        lo = connection.get_command('LoadObjects')
+        lo.set_cmd(['R0000001'], props=['object_desc'])
+        lo.set_property_policy(tc_slreq.CONTENTS_POLICY)
+        self.assertEqual(conn.handle(lo)[0]["props"]["object_desc"]["uiValues"], ['Edited description'])
+        self.assertEqual(self.fake.requests['loadObjects'], 1)
+
+    def test_warm_up(self):
+        self.conn.revision_rules.invalidate()
+        self.fake.latency = 0.05
+
+        warming_up = connection.warm_up()
+        self.assertIs(connection.warm_up(), warming_up)
+
+        #waits on the warm-up instead of logging in itself
+        conn = connection.get_connection()
+        self.assertFalse(warming_up.running)
+        self.assertIsNone(warming_up.error)
+        self.assertTrue(conn.logged_in)
+        self.assertEqual(self.fake.requests['login'], 1)
+        self.assertEqual(self.fake.requests['getRevisionRules'], 1)
+        self.assertEqual(self.fake.requests['findSavedQueries'], 1)
+
+        grr = connection.get_command('GetRevisionRule')
+        grr.set_cmd('Latest Working')
+        conn.handle(grr)
+        fsq = connection.get_command('FindSavedQuery')
+        fsq.set_cmd('Item Revision...')
+        conn.handle(fsq)
+        self.assertEqual(self.fake.requests['getRevisionRules'], 1)
+        self.assertEqual(self.fake.requests['findSavedQueries'], 1)
+
+        #logged in already, nothing to warm up
+        self.assertIs(connection.warm_up(), warming_up)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_metrics.py'
+
+
+
+import unittest
+from unittest import TestCase
+
+from teamcenter import connection, metrics
+from teamcenter.commands import get_command
+from fakeserver import FakeTcServer, FakeCredentials
+
+class TestHistogram(TestCase):
+
+    def test_snapshot(self):
+        histogram = metrics.Histogram((1, 2, 4, 8))
+        for value in (0.5, 1.5, 1.5, 3, 100):
+            histogram.add(value)
+        snapshot = histogram.snapshot()
+
+        self.assertEqual((snapshot["count"], snapshot["min"], snapshot["max"]), (5, 0.5, 100))
+        self.assertEqual(snapshot["p50"], 2)
+        self.assertEqual(snapshot["p99"], 100)
+        self.assertEqual(snapshot["buckets"], [[1, 1], [2, 2], [4, 1], [None, 1]])
+
+    def test_empty(self):
+        self.assertIsNone(metrics.Histogram((1,)).snapshot()["p50"])
+
+class MockAlias(object):
+    name = 'MOCK_METRICS'
+
+class MockMeasuredCmd(object):
+    def __init__(self, fail=False):
+        self.fail = fail
+
+def mock_measured_handle(conn, cmd):
+    timing = metrics.current_timing()
+    timing.add_request('op', 100, 0.001, 0.002)
+    timing.add_response(1000, 0.001)
+    if cmd.fail:
+        raise ValueError('failed')
+    return True
+
+class TestMetrics(TestCase):
+
+    def setUp(self):
+        connection.HANDLERS[MockMeasuredCmd] = mock_measured_handle
+        self.conn = connection.TcSession(MockAlias(), object())
+        self.conn.metrics.clear()
+
+    def tearDown(self):
+        del connection.HANDLERS[MockMeasuredCmd]
+        metrics.enable_metrics(True)
+
+    def test_handle(self):
+        self.conn.handle(MockMeasuredCmd())
+        self.assertRaises(ValueError, self.conn.handle, MockMeasuredCmd(fail=True))
+
+        stats = self.conn.stats()["MockMeasuredCmd"]["op"]
+        self.assertEqual((stats["calls"], stats["requests"]), (2, 2))
+        self.assertEqual(stats["errors"], {"ValueError": 1})
+        self.assertEqual(stats["histograms"]["response_bytes"]["sum"], 2000)
+        self.assertEqual(stats["histograms"]["total"]["count"], 2)
+
+    def test_disabled(self):
+        metrics.enable_metrics(False)
+        connection.HANDLERS[MockMeasuredCmd] = lambda conn, cmd: metrics.current_timing()
+
+        self.assertIsNone(self.conn.handle(MockMeasuredCmd()))
+        self.assertEqual(self.conn.stats(), {})
+
+class TestMetricsFakeServer(TestCase):
+
+    def test_stats(self):
+        with FakeTcServer(requirements=5, name='FAKE_METRICS') as fake:
+            conn = connection.TcConnection(fake.alias, FakeCredentials())
+            try:
+                conn.login()
+                gifi = get_command('GetItemFromId')
+                gifi.set_cmd('REQ-0000001', 'A')
+                conn.handle(gifi)
+            finally:
+                connection.close_connections()
+
+        stats = conn.stats()["GetItemFromId"]["getItemFromId"]["histograms"]
+        self.assertGreater(stats["request_bytes"]["sum"], 0)
+        self.assertGreater(stats["response_bytes"]["sum"], 0)
+        self.assertGreater(stats["network"]["sum"], 0)
+        self.assertIn("login", conn.stats()["Login"])
+
+if __name__ == '__main__':
+    unittest.main()
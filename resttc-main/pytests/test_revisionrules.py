@@ -0,0 +1,97 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_revisionrules.py'
+
+
+
+import datetime
+import threading
+import unittest
+from unittest import TestCase
+
+from teamcenter import revisionrules
+from teamcenter.commands import get_command
+
+def rev_rule(uid, name):
+    return {"uid": uid, "type": "RevisionRule",
+            "props": {"object_name": {"uiValues": [name], "dbValues": [name]}}}
+
+class MockRulesConn(object):
+
+    def __init__(self):
+        self.fetches = 0
+        self.fetched = threading.Event()
+        self.rules = [rev_rule('r1', 'Latest Working'), rev_rule('r2', 'Any Status; Working')]
+
+    def handle(self, cmd):
+        self.fetches += 1
+        self.fetched.set()
+        return list(self.rules)
+
+class TestRevisionRuleIndex(TestCase):
+
+    def test_lookup(self):
+        conn = MockRulesConn()
+        index = revisionrules.RevisionRuleIndex(ttl=60)
+
+        self.assertEqual(index.get(conn, 'Latest Working')["uid"], 'r1')
+        self.assertEqual(index.get_by_uid(conn, 'r2')["uid"], 'r2')
+        self.assertIsNone(index.get(conn, 'Precise Only'))
+        self.assertEqual(conn.fetches, 1)
+
+    def test_background_refresh(self):
+        conn = MockRulesConn()
+        index = revisionrules.RevisionRuleIndex(ttl=0)
+        index.get(conn, 'Latest Working')
+
+        conn.fetched.clear()
+        conn.rules.append(rev_rule('r3', 'Precise Only'))
+
+        #answered from the current index while refreshed
+        index.get(conn, 'Precise Only')
+        self.assertTrue(conn.fetched.wait(5))
+        while index.refreshes < 2: conn.fetched.wait(0.001)
+
+        self.assertEqual(index.get_by_uid(conn, 'r3')["uid"], 'r3')
+
+class TestEffectivity(TestCase):
+
+    def test_bom_window_effectivity(self):
+        cbw = get_command('CreateBOMWindow')
+        cbw.set_cmd({"uid": "spec"}, {"uid": "r1"}, datetime.datetime(2023, 1, 2), 5)
+        props = cbw.cmd_json["body"]["info"][0]["revRuleConfigInfo"]["props"]
+
+        self.assertEqual(props["date"], '2023-01-02T00:00:00')
+        self.assertEqual(props["unitNo"], 5)
+        self.assertFalse(props["today"])
+
+    def test_bom_window_today(self):
+        cbw = get_command('CreateBOMWindow')
+        cbw.set_cmd({"uid": "spec"}, {"uid": "r1"})
+        props = cbw.cmd_json["body"]["info"][0]["revRuleConfigInfo"]["props"]
+
+        self.assertEqual((props["date"], props["unitNo"], props["today"]), ('', -1, True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -53,6 +53,19 @@ class TestServices(TestCase):
         session_svc = services.get_service('Session')
         result = session_svc.login(MockConn(), MockCmd())
         self.assertTrue(result.endswith('/login'))
+
+    def test_api_table(self):
+        try:
+            import inflection
+        except ImportError:
+            self.skipTest('inflection is not installed')
+
+        #the precomputed names are those of the endpoints, snake cased
+        for endpoint, (service_name, api_name) in services.API_TABLE.items():
+            service, api = endpoint.rsplit('/', 1)
+            self.assertEqual(service.rsplit('-', 1)[1], service_name)
+            self.assertEqual(inflection.underscore(api), api_name)
+            self.assertTrue(hasattr(services.get_service(service_name), api_name))
     
     
 if __name__ == '__main__':
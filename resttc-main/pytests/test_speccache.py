@@ -0,0 +1,69 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_speccache.py'
+
+
+import tempfile
+import unittest
+from unittest import TestCase
+
+from teamcenter import speccache
+
+def cached_spec(last_mod_date):
+    return speccache.CachedSpec('SPEC', 'SPEC-1_A', last_mod_date,
+        ['Req'], [0], ['REQ-1_A'], {"children": {"SPEC": ["R1"]}, "objects": {}},
+        {'REQ-1_A': {"uid": "R1", "type": "Requirement Revision", "html": "<p>Req</p>"}}, 0)
+
+class TestSpecCache(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = speccache.SpecCache(self.tmpdir.name + '/cache.sqlite')
+
+    def tearDown(self):
+        self.cache._db().close()
+        self.tmpdir.cleanup()
+
+    def test_put_get(self):
+        self.cache.put_spec('DEV', 'Latest Working', cached_spec('2022-01-01'))
+
+        spec = self.cache.find_spec('DEV', 'SPEC-1_A', 'Latest Working')
+        self.assertEqual(spec.spec_uid, 'SPEC')
+        self.assertEqual(spec.last_mod_date, '2022-01-01')
+        self.assertEqual(spec.locations, ['REQ-1_A'])
+        self.assertEqual(spec.contents['REQ-1_A']['html'], '<p>Req</p>')
+
+        self.assertIsNone(self.cache.find_spec('PROD', 'SPEC-1_A', 'Latest Working'))
+        self.assertIsNone(self.cache.get_spec('DEV', 'SPEC', 'Precise'))
+
+    def test_replace_and_invalidate(self):
+        self.cache.put_spec('DEV', 'Latest Working', cached_spec('2022-01-01'))
+        self.cache.put_spec('DEV', 'Latest Working', cached_spec('2022-02-01'))
+        self.assertEqual(self.cache.get_spec('DEV', 'SPEC', 'Latest Working').last_mod_date, '2022-02-01')
+
+        self.cache.invalidate('DEV')
+        self.assertIsNone(self.cache.get_spec('DEV', 'SPEC', 'Latest Working'))
+    
+if __name__ == '__main__':
+    unittest.main()
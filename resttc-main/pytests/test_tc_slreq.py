@@ -0,0 +1,171 @@
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com'
+__version__ = '0.1'
+__filename__ = 'test_tc_slreq.py'
+
+
+import io
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import TestCase
+
+from teamcenter import tc_slreq, speccache, codec
+
+def bom_line(uid):
+    return {"itemRevOfBOMLine": {"uid": uid}}
+
+def req(uid, item_id, name):
+    return {"uid": uid, "type": "Requirement Revision", "props": {"object_string": {"uiValues": ["{}/A;1-{}".format(item_id, name)]}}}
+
+SPEC_CONTENTS = {
+    "output": [
+        {"parent": bom_line("R1"), "children": [bom_line("R3")]},
+        {"parent": None, "children": []},
+        {"parent": bom_line("SPEC"), "children": [bom_line("R1"), bom_line("R2")]},
+        {"parent": bom_line("R2"), "children": []},
+        {"parent": bom_line("R3"), "children": []},
+    ],
+    "ServiceData": {"modelObjects": {
+        "SPEC": {"uid": "SPEC", "type": "RequirementSpec Revision"},
+        "R1": req("R1", "REQ-1", "First"),
+        "R2": req("R2", "REQ-2", "Second"),
+        "R3": req("R3", "REQ-3", "Nested"),
+    }}
+}
+
+class MockHTMLConn(object):
+    def __init__(self):
+        self.chunks = []
+
+    def handle(self, gh):
+        self.chunks.append(gh.item_strs)
+        gh.image_count = len(gh.item_strs)
+        gh.image_download_span = (len(self.chunks), len(self.chunks) + 0.5)
+        return ['<p>{}</p>'.format(item_str) for item_str in gh.item_strs]
+
+    def handle_many(self, ghs, max_concurrency):
+        return [self.handle(gh) for gh in reversed(ghs)][::-1]
+
+class MockRefreshConn(MockHTMLConn):
+
+    def __init__(self, last_mod_dates):
+        super().__init__()
+        self.last_mod_dates = last_mod_dates
+
+    def handle(self, cmd):
+        if type(cmd).__name__ != 'GetProperties':
+            return super().handle(cmd)
+
+        model_objects = {}
+        for tc_obj in cmd.tc_objs:
+            mo = req(tc_obj["uid"], "REQ-" + tc_obj["uid"][1:], "Req")
+            mo["props"]["last_mod_date"] = {"dbValues": [self.last_mod_dates[tc_obj["uid"]]]}
+            model_objects[tc_obj["uid"]] = mo
+        return {"plain": list(model_objects), "modelObjects": model_objects}
+
+class TestTcSlreq(TestCase):
+
+    def test_matlab_content(self):
+        labels, depths, locations = [], [], []
+        tc_slreq.matlab_content({"uid": "SPEC"}, SPEC_CONTENTS, labels, depths, locations)
+
+        self.assertEqual(labels, ['First', 'Nested', 'Second'])
+        self.assertEqual(depths, [0, 1, 0])
+        self.assertEqual(locations, ['REQ-1_A', 'REQ-3_A', 'REQ-2_A'])
+
+    def test_structure_round_trip(self):
+        contents = tc_slreq.contents_of(tc_slreq.structure_of(SPEC_CONTENTS))
+
+        expected, actual = ([], [], []), ([], [], [])
+        tc_slreq.matlab_content({"uid": "SPEC"}, SPEC_CONTENTS, *expected)
+        tc_slreq.matlab_content({"uid": "SPEC"}, contents, *actual)
+        self.assertEqual(actual, expected)
+
+    def test_structure_of_stream(self):
+        data = codec.JsonCodec().dumps(SPEC_CONTENTS)
+        events = codec.iter_stream(io.BytesIO(data), ('output',), ('ServiceData.modelObjects',))
+
+        self.assertEqual(tc_slreq.structure_of_stream(events), tc_slreq.structure_of(SPEC_CONTENTS))
+
+    def test_get_contents_from_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            speccache.set_cache_dir(tmpdir)
+            try:
+                speccache.get_spec_cache().put_spec(tc_slreq.get_configured_alias().name, tc_slreq.REVISION_RULE,
+                    speccache.CachedSpec('SPEC', 'SPEC-1_A', None, ['First'], [0], ['REQ-1_A'],
+                        tc_slreq.structure_of(SPEC_CONTENTS),
+                        {'REQ-1_A': {"uid": "R1", "type": "Requirement Revision", "html": "<p>First</p>"}}, 0))
+
+                contents = tc_slreq.get_contents('SPEC-1_A;Spec', use_cache=True, check_fresh=False)
+
+                self.assertEqual(contents, (['First'], [0], ['REQ-1_A']))
+                self.assertEqual(tc_slreq.get_viewable_html('SPEC-1_A', 'REQ-1_A'), '<p>First</p>')
+            finally:
+                speccache.get_spec_cache()._db().close()
+                speccache.CACHE_DIR = None
+                speccache.SPEC_CACHE = None
+
+    def test_update_contents(self):
+        conn = MockRefreshConn({"R1": "1", "R2": "2", "R3": "1"})
+        previous = {
+            'REQ-1_A': {"uid": "R1", "type": "Requirement Revision", "last_mod_date": "1", "html": "<p>cached</p>"},
+            'REQ-2_A': {"uid": "R2", "type": "Requirement Revision", "last_mod_date": "1", "html": "<p>cached</p>"},
+        }
+
+        spec = tc_slreq.update_contents(conn, {"uid": "SPEC"}, 'SPEC-1_A', '1',
+                                        tc_slreq.structure_of(SPEC_CONTENTS), previous)
+
+        self.assertEqual(conn.chunks, [['REQ-2_A', 'REQ-3_A']])
+        self.assertEqual(spec.contents['REQ-1_A']['html'], '<p>cached</p>')
+        self.assertEqual(spec.contents['REQ-2_A']['html'], '<p>REQ-2_A</p>')
+        self.assertEqual(spec.contents['REQ-3_A']['last_mod_date'], '1')
+        self.assertEqual(spec.locations, ['REQ-1_A', 'REQ-3_A', 'REQ-2_A'])
+
+    def test_cache_all_html_chunks(self):
+        conn = MockHTMLConn()
+        tc_objs = [req("R{}".format(i), "REQ-{}".format(i), "Req") for i in range(5)]
+
+        stats = {}
+        htmls = tc_slreq.cache_all_html(conn, tc_objs, chunk_size=2, stats=stats)
+
+        self.assertEqual([len(chunk) for chunk in conn.chunks], [1, 2, 2])
+        self.assertEqual(htmls, ['<p>REQ-{}_A</p>'.format(i) for i in range(5)])
+        self.assertEqual(stats, {"images": 5, "image_download_time": 2.5})
+    
+class TestColdStart(TestCase):
+
+    def test_import_defers_modules(self):
+        #a fresh interpreter, as matlab imports tc_slreq at the start of every session
+        script = ("import sys, teamcenter.tc_slreq, teamcenter.connection as c\n"
+                  "print(','.join(m for m in ('requests', 'bs4', 'cryptography', 'inflection') if m in sys.modules))\n"
+                  "print(c.SET_ALIAS)")
+        output = subprocess.run([sys.executable, '-c', script], check=True, cwd=str(Path(__file__).resolve().parents[1]),
+                                capture_output=True, text=True).stdout.splitlines()
+
+        self.assertEqual(output, ['', 'None'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,7 +28,8 @@ setup(name='Siemens Teamcenter integration',
       author='Jason Wickers',
       author_email='jason.wickers@siemens.com',
       packages=['teamcenter'],
-      install_requires=['certifi','requests','inflection','bs4','cryptography'],
+      install_requires=['certifi','requests','bs4','cryptography'],
+      extras_require={'fast': ['orjson'], 'stream': ['ijson']},
       package_data={'teamcenter': ['icons/*.png','matlab/*.m']},
       data_files=[('teamcenter', ['tcaliases.ini','docs/Install Guide - Requirements integration for MATLAB_SIMULINK.pdf'])],
       scripts=['scripts/tc_credential.py'],
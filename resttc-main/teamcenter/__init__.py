@@ -1,7 +1,11 @@
-
 from .alias import set_alias_dir
 from .credentials import set_credential_dir
 
-def init_python(python_home):
+def init_python(python_home, warm_up=False):
     set_alias_dir(python_home)
-    set_credential_dir(python_home)
\ No newline at end of file
+    set_credential_dir(python_home)
+
+    if warm_up:
+        #imported here, importing teamcenter stays cheap for matlab
+        from .connection import warm_up as start_warm_up
+        start_warm_up()
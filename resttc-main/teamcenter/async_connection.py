@@ -0,0 +1,90 @@
+"""
+    Asyncio counterpart of the connection, handling commands over a pool
+    of Teamcenter sessions without blocking the event loop
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'async_connection.py'
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from teamcenter.connection import TcConnectionPool
+from teamcenter.metrics import get_metrics
+
+
+class AsyncTcConnection(object):
+    '''
+    Handles commands from an event loop.
+
+    Commands are built exactly as for TcConnection and handled by a pool of
+    up to max_size sessions of the alias, each logged in once and used by
+    one command at a time, with its relogin, metrics and cassette. The
+    blocking handle runs on worker threads, a command checking a session
+    out of the pool for the time it is in flight.
+
+    Each command in flight still holds a worker thread: this offloads the
+    requests sessions, it is not an asyncio transport, and max_size bounds
+    the threads as well as the sessions.
+    '''
+    def __init__(self, alias=None, credentials=None, max_size=8):
+        self.pool = TcConnectionPool(alias, credentials, max_size=max_size)
+        self.alias = self.pool.alias
+        self.max_size = max_size
+        self.metrics = get_metrics(self.alias.name)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_size,
+                                            thread_name_prefix='tc-async')
+        self._slots = None
+
+    async def handle(self, cmd):
+        #bound waiting commands in the loop, not on worker threads
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            return await loop.run_in_executor(self._executor, self._handle, cmd)
+
+    def _handle(self, cmd):
+        with self.pool.connection() as conn:
+            return conn.handle(cmd)
+
+    def stats(self):
+        '''Snapshot of the metrics of the commands handled for the alias, see metrics.Metrics'''
+        return self.metrics.snapshot()
+
+    async def close(self, logout=True):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self.pool.close, logout)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,205 @@
+"""
+    Client side caching of Teamcenter service responses
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'cache.py'
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+def fingerprint(endpoint, data):
+    '''Key of a request: the endpoint and the request body encoded with sorted keys'''
+    return hashlib.sha256(endpoint.encode('utf-8') + b'\n' + data).hexdigest()
+
+class SingleFlight(object):
+    '''
+    Coalesces concurrent calls by key: a call made while another with the
+    same key is in flight waits for it and gets its result or exception.
+    Results are shared, not copied.
+
+    Exceptions of the types in retry are the leader's own, such as its
+    session expiring: a waiting call then makes its own call instead.
+    '''
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn, retry=()):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            try:
+                return call.result()
+            except retry:
+                return fn()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+SINGLE_FLIGHTS = {}
+_FLIGHTS_LOCK = threading.Lock()
+def get_single_flight(alias_name):
+    with _FLIGHTS_LOCK:
+        single_flight = SINGLE_FLIGHTS.get(alias_name)
+        if single_flight is None:
+            single_flight = SINGLE_FLIGHTS[alias_name] = SingleFlight()
+
+    return single_flight
+
+
+#responses of an operation cached beyond this are evicted, least recently used first
+DEFAULT_MAX_ENTRIES = 256
+
+class CacheRule(object):
+    '''How long responses of an operation are kept, in seconds, and how many of them'''
+    def __init__(self, ttl, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+#cached operations of read only commands, by operation name of the endpoint,
+#revision rules are kept in revisionrules.RevisionRuleIndex
+CACHE_RULES = {
+    'describeSavedQueries': CacheRule(600, 64),
+    'findSavedQueries': CacheRule(3600, 64),
+    'getItemFromId': CacheRule(60, 1024),
+    'loadObjects': CacheRule(30, 1024),
+}
+
+def set_cache_rule(operation, ttl, max_entries=DEFAULT_MAX_ENTRIES):
+    '''Caches responses of the operation, ttl None to not cache it'''
+    global CACHE_RULES
+
+    if ttl is None:
+        CACHE_RULES.pop(operation, None)
+    else:
+        CACHE_RULES[operation] = CacheRule(ttl, max_entries)
+
+    for response_cache in list(RESPONSE_CACHES.values()):
+        response_cache.invalidate(operation)
+
+def operation_of(endpoint):
+    return endpoint.rsplit('/', 1)[-1]
+
+class ResponseCache(object):
+    '''
+    Responses of the operations with a CacheRule, by request fingerprint,
+    expiring after the ttl of the rule. Cached responses are shared, not
+    copied.
+    '''
+    def __init__(self, rules=None):
+        self.rules = CACHE_RULES if rules is None else rules
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+    def rule(self, operation):
+        return self.rules.get(operation)
+
+    def get(self, operation, key):
+        '''(True, response) if cached and not expired, otherwise (False, None)'''
+        with self._lock:
+            entries = self._entries.get(operation)
+            entry = None if entries is None else entries.get(key)
+
+            if entry is not None and entry[0] < time.monotonic():
+                del entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses[operation] = self.misses.get(operation, 0) + 1
+                return False, None
+
+            entries.move_to_end(key)
+            self.hits[operation] = self.hits.get(operation, 0) + 1
+            return True, entry[1]
+
+    def put(self, operation, key, response):
+        rule = self.rule(operation)
+        if rule is None:
+            return
+
+        with self._lock:
+            entries = self._entries.setdefault(operation, OrderedDict())
+            entries[key] = (time.monotonic() + rule.ttl, response)
+            entries.move_to_end(key)
+
+            while len(entries) > rule.max_entries:
+                entries.popitem(last=False)
+
+    def invalidate(self, *operations):
+        '''Removes the responses of the operations, of all operations if none given'''
+        with self._lock:
+            if not operations:
+                self._entries.clear()
+            for operation in operations:
+                self._entries.pop(operation, None)
+
+    def stats(self):
+        '''hits, misses and entries by operation'''
+        with self._lock:
+            operations = set(self.hits) | set(self.misses) | set(self._entries)
+            return dict((operation, {"hits": self.hits.get(operation, 0),
+                                     "misses": self.misses.get(operation, 0),
+                                     "entries": len(self._entries.get(operation, ()))})
+                        for operation in operations)
+
+
+RESPONSE_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+def get_response_cache(alias_name):
+    with _CACHES_LOCK:
+        response_cache = RESPONSE_CACHES.get(alias_name)
+        if response_cache is None:
+            response_cache = RESPONSE_CACHES[alias_name] = ResponseCache()
+
+    return response_cache
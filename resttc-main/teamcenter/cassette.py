@@ -0,0 +1,267 @@
+"""
+    Recording of Teamcenter requests and responses to a cassette file, and
+    their replay without a server
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'cassette.py'
+
+import base64
+import gzip
+import io
+import json
+import threading
+import urllib.parse
+from collections import deque
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+#request values left out of cassettes and of the matching of requests
+SCRUBBED_KEYS = ('credentials',)
+
+class CassetteMiss(Exception): pass
+
+class ReplayCredentials(object):
+    '''Credentials for replaying, the login is answered from the cassette'''
+    username = 'replay'
+    password = 'replay'
+
+def _scrub(value):
+    if isinstance(value, dict):
+        return dict((key, '' if key in SCRUBBED_KEYS else _scrub(item)) for key, item in value.items())
+    elif isinstance(value, list):
+        return [_scrub(item) for item in value]
+    return value
+
+def _decode_json(data):
+    if not data:
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+def _path_of(url):
+    parts = urllib.parse.urlsplit(url)
+    if not parts.query:
+        return parts.path
+
+    query = sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    return parts.path + '?' + urllib.parse.urlencode(query)
+
+def request_key(method, url, body):
+    '''
+    Matches a request to recorded ones: method, path with its sorted query
+    (FMS downloads differ by their ticket only) and canonical scrubbed body
+    '''
+    path = _path_of(url)
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+
+    document = _decode_json(body)
+    if document is None:
+        canonical = (body or b'').decode('utf-8', 'replace')
+    else:
+        canonical = json.dumps(_scrub(document), sort_keys=True, separators=(',', ':'))
+
+    return method, path, canonical
+
+class Anonymizer(object):
+    '''
+    Replaces uids by U0000000000001, U0000000000002... in JSON documents,
+    consistently over all the documents of a cassette. Uids are the values
+    of uid keys and the keys of modelObjects.
+    '''
+    def __init__(self):
+        self.uids = {}
+
+    def _collect(self, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == 'uid' and isinstance(item, str) and item:
+                    self.uids.setdefault(item, 'U{:013d}'.format(len(self.uids) + 1))
+                elif key == 'modelObjects' and isinstance(item, dict):
+                    for uid in item:
+                        self.uids.setdefault(uid, 'U{:013d}'.format(len(self.uids) + 1))
+                self._collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                self._collect(item)
+
+    def _replace(self, value):
+        if isinstance(value, dict):
+            return dict((self.uids.get(key, key), self._replace(item)) for key, item in value.items())
+        elif isinstance(value, list):
+            return [self._replace(item) for item in value]
+        elif isinstance(value, str):
+            return self.uids.get(value, value)
+        return value
+
+    def anonymize(self, document):
+        self._collect(document)
+        return self._replace(document)
+
+class Cassette(object):
+    '''
+    Interactions recorded in a file, one JSON object per line, gzip
+    compressed when the file name ends with .gz (or compress is True).
+    Each interaction has method, url path and query, request body, status,
+    content type and response body, as text or base64. Credentials and
+    cookies are never written; FMS tickets are, as in the recorded HTML.
+    '''
+    def __init__(self, path, anonymize=False, compress=None):
+        self.path = str(path)
+        self.compress = self.path.endswith('.gz') if compress is None else compress
+        self.anonymizer = Anonymizer() if anonymize else None
+        self.interactions = []
+        self.closed = False
+        self._lock = threading.Lock()
+        self._out = None
+
+    def _open(self, mode):
+        if self.compress:
+            return gzip.open(self.path, mode + 't', encoding='utf-8')
+        return open(self.path, mode, encoding='utf-8')
+
+    def _document(self, data):
+        document = _decode_json(data)
+        if document is None:
+            return None
+        document = _scrub(document)
+        return document if self.anonymizer is None else self.anonymizer.anonymize(document)
+
+    def record(self, method, url, request_body, status, content_type, content):
+        if isinstance(request_body, str):
+            request_body = request_body.encode('utf-8')
+
+        with self._lock:
+            #sessions outliving the recording are no longer recorded
+            if self.closed:
+                return
+
+            request_document = self._document(request_body)
+            response_document = self._document(content)
+
+            interaction = {"method": method, "path": _path_of(url),
+                           "status": status, "content_type": content_type}
+            if request_document is not None:
+                interaction["request"] = request_document
+            elif request_body:
+                interaction["request_text"] = request_body.decode('utf-8', 'replace')
+
+            if response_document is not None:
+                interaction["response"] = response_document
+            else:
+                interaction["response_base64"] = base64.b64encode(content or b'').decode('ascii')
+
+            self.interactions.append(interaction)
+            if self._out is None:
+                self._out = self._open('w')
+            self._out.write(json.dumps(interaction, separators=(',', ':')) + '\n')
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            if self._out is not None:
+                self._out.close()
+                self._out = None
+
+    @classmethod
+    def load(cls, path, compress=None):
+        cassette = cls(path, compress=compress)
+        with cassette._open('r') as fp:
+            cassette.interactions = [json.loads(line) for line in fp if line.strip()]
+        return cassette
+
+    @staticmethod
+    def body_of(interaction):
+        if "response" in interaction:
+            return json.dumps(interaction["response"], separators=(',', ':')).encode('utf-8')
+        return base64.b64decode(interaction["response_base64"])
+
+    @staticmethod
+    def key_of(interaction):
+        if "request" in interaction:
+            body = json.dumps(interaction["request"]).encode('utf-8')
+        else:
+            body = interaction.get("request_text", '').encode('utf-8')
+        return request_key(interaction["method"], interaction["path"], body)
+
+def _raw_response(status, content_type, content, original_response=None):
+    headers = {'Content-Type': content_type or 'application/json', 'Content-Length': str(len(content))}
+    return HTTPResponse(body=io.BytesIO(content), headers=headers, status=status,
+                        preload_content=False, decode_content=False,
+                        original_response=original_response)
+
+class RecordingAdapter(HTTPAdapter):
+    '''Sends requests as usual and records them with their responses in the cassette'''
+    def __init__(self, cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+
+        content = response.content
+        content_type = response.headers.get('Content-Type')
+        self.cassette.record(request.method, request.url, request.body,
+                             response.status_code, content_type, content)
+
+        #the content is read, it is served again to streamed reads, keeping the cookies
+        response.raw = _raw_response(response.status_code, content_type, content,
+                                     getattr(response.raw, '_original_response', None))
+        response._content = False
+        response._content_consumed = False
+        return response
+
+class ReplayAdapter(BaseAdapter):
+    '''
+    Answers requests with the responses recorded for them, in recorded
+    order; once all are used the last one is repeated. Raises CassetteMiss
+    for requests never recorded.
+    '''
+    def __init__(self, cassette):
+        super().__init__()
+        self.cassette = cassette
+        self._builder = HTTPAdapter()
+        self._responses = {}
+        self._lock = threading.Lock()
+        for interaction in cassette.interactions:
+            self._responses.setdefault(Cassette.key_of(interaction), deque()).append(interaction)
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteMiss('No response recorded for {} {}'.format(request.method, key[1]))
+            interaction = responses.popleft() if len(responses) > 1 else responses[0]
+
+        raw = _raw_response(interaction["status"], interaction.get("content_type"), Cassette.body_of(interaction))
+        return self._builder.build_response(request, raw)
+
+    def close(self):
+        self._builder.close()
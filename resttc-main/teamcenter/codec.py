@@ -0,0 +1,170 @@
+"""
+    JSON encoding and decoding of Teamcenter service requests and responses
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'codec.py'
+
+import json
+
+def to_json(obj):
+    '''Plain JSON value of objects such as datamodel.ModelObject'''
+    if hasattr(obj, 'to_json'):
+        return obj.to_json()
+
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+
+class JsonCodec(object):
+    '''
+    The standard library json codec, encoding to and decoding from bytes
+    '''
+    name = 'json'
+
+    def dumps(self, obj, sort_keys=False):
+        return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), default=to_json).encode('utf-8')
+
+    def loads(self, data):
+        #json detects the encoding of bytes itself
+        return json.loads(data)
+
+class OrjsonCodec(object):
+    '''
+    orjson codec, used when orjson is installed
+    '''
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj, sort_keys=False):
+        return self._orjson.dumps(obj, default=to_json,
+                                  option=self._orjson.OPT_SORT_KEYS if sort_keys else None)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+CODECS = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec,
+}
+
+class UndefinedCodec(Exception): pass
+
+def create_codec(name):
+    codec = CODECS.get(name)
+    if codec is None:
+        raise UndefinedCodec('No JSON codec defined called: {}'.format(name))
+
+    return codec()
+
+def default_codec():
+    try:
+        return create_codec('orjson')
+    except ImportError:
+        return create_codec('json')
+
+CODEC = default_codec()
+def set_codec(name):
+    global CODEC
+
+    CODEC = create_codec(name)
+
+def get_codec():
+    global CODEC
+
+    return CODEC
+
+def iter_stream(fp, arrays=(), maps=(), fields=()):
+    '''
+    Yields (path, key, value) for each item of the arrays and each entry of
+    the maps found at the given dotted paths of the JSON document in fp,
+    key being None for array items, and (name, None, value) for the scalar
+    top level fields named.
+
+    Parsed incrementally with ijson when installed, keeping only one item
+    in memory at a time; otherwise the document is decoded as a whole.
+    '''
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is None:
+        document = get_codec().loads(fp.read())
+        if isinstance(document, dict):
+            for name in fields:
+                if name in document:
+                    yield name, None, document[name]
+        for path in arrays:
+            for value in _lookup(document, path, []):
+                yield path, None, value
+        for path in maps:
+            for key, value in _lookup(document, path, {}).items():
+                yield path, key, value
+        return
+
+    array_items = dict((path + '.item', path) for path in arrays)
+    maps = set(maps)
+    fields = set(fields)
+
+    builder = None
+    path, key = None, None
+    depth = 0
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if builder is None:
+            if prefix in fields and event in ('string', 'number', 'boolean', 'null'):
+                yield prefix, None, value
+                continue
+
+            if event == 'map_key' and prefix in maps:
+                path, key = prefix, value
+                continue
+
+            if prefix in array_items:
+                path, key = array_items[prefix], None
+            elif key is None or not prefix.startswith(path + '.'):
+                continue
+
+            builder = ijson.ObjectBuilder()
+            depth = 0
+
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+
+        if depth == 0:
+            yield path, key, builder.value
+            builder = None
+            key = None
+
+def _lookup(document, path, default):
+    for name in path.split('.'):
+        if not isinstance(document, dict) or name not in document:
+            return default
+        document = document[name]
+    return document
@@ -39,11 +39,69 @@ import uuid
 import inspect
 import pprint
 import tempfile
-from urllib.request import urlretrieve
-from bs4 import BeautifulSoup
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from teamcenter.speccache import get_image_dir
+from teamcenter.codec import get_codec, iter_stream
+from teamcenter.datamodel import compact_response
+from teamcenter.cache import fingerprint, operation_of
+from teamcenter.metrics import current_timing
 
 from pathlib import Path, PurePath
 
+class TcServiceException(Exception):
+    '''A service exception returned by Teamcenter instead of a response'''
+    def __init__(self, message, qname=None, code=None):
+        super().__init__(message)
+        self.qname = qname
+        self.code = code
+
+class InvalidSessionException(TcServiceException):
+    '''The session expired or is otherwise no longer valid, login again'''
+    pass
+
+#top level fields of a service exception payload
+EXCEPTION_FIELDS = ('.QName', 'message', 'code')
+
+def check_service_exception(executed_result):
+    if not isinstance(executed_result, dict):
+        return
+
+    qname = executed_result.get(".QName", "")
+    if "Exceptions." not in qname:
+        return
+
+    message = executed_result.get("message", qname)
+    code = executed_result.get("code")
+    if qname.rsplit(".", 1)[-1] in ("InvalidUserException", "InvalidSessionException"):
+        raise InvalidSessionException(message, qname, code)
+
+    raise TcServiceException(message, qname, code)
+
+class PropertyPolicy(object):
+    '''
+    Object property policy: the properties returned per type in responses,
+    instead of the server default policy. Types apply to their subtypes.
+    '''
+    def __init__(self, types=None):
+        self.types = dict((name, list(props)) for name, props in (types or {}).items())
+
+    def add(self, type_name, props):
+        self.types.setdefault(type_name, [])
+        self.types[type_name].extend(prop for prop in props if prop not in self.types[type_name])
+
+    def to_json(self):
+        return {
+            "types": [
+                {
+                    "name": name,
+                    "properties": [{"name": prop} for prop in props]
+                } for name, props in self.types.items()
+            ]
+        }
+
 class TcCommand(object):
     DEFAULT_JSON_CMD = {
           "header": {
@@ -55,36 +113,178 @@ class TcCommand(object):
           "body": {}
         }
     
+    #commands that do not change data on the server, identical ones in flight are coalesced
+    #and responses are cached per the cache rule of the operation, see cache.CACHE_RULES
+    READ_ONLY = False
+    #read only commands answering about the session sending them, never coalesced nor cached
+    SESSION_SCOPED = False
+    #operations whose cached responses are invalidated by this command
+    INVALIDATES = ()
+    
     def __init__(self):
         self.cmd_json = {}
         self.cmd_json.update(TcCommand.DEFAULT_JSON_CMD)
+        self.property_policy = None
         
     def set_cmd(self,*args,**kwargs):
         raise NotImplementedError('Implement Me')
+
+    def set_property_policy(self, policy):
+        '''policy for this command, overriding the policy of the connection'''
+        self.property_policy = policy
         
     def send_to(self, conn, endpoint):
         raise NotImplementedError('Implement Me')
+
+    def get_property_policy(self, conn):
+        if self.property_policy is not None:
+            return self.property_policy
+
+        return getattr(conn, 'property_policy', None)
+
+    def request_json(self, conn):
+        policy = self.get_property_policy(conn)
+        if policy is None:
+            return self.cmd_json
+
+        #the header is shared by commands, do not update it in place
+        cmd_json = dict(self.cmd_json)
+        cmd_json["header"] = dict(self.cmd_json["header"], policy=policy.to_json())
+        return cmd_json
         
-    def _send_to(self, conn, endpoint):
+    def encode(self, conn, sort_keys=False):
+        '''The request body as posted and the seconds taken to encode it'''
+        start = time.perf_counter()
+        data = get_codec().dumps(self.request_json(conn), sort_keys=sort_keys)
+        return data, time.perf_counter() - start
+
+    def _post(self, conn, endpoint, stream=False, encoded=None):
         
         headers = {}
         headers.update({'Cache-Control':'no-cache, no-store, must-revalidate'})
         headers.update({'Pragma':'no-cache'})
         headers.update({'Expires':'0'})
 
+        #encoded already when its fingerprint was needed
+        if encoded is None:
+            encoded = self.encode(conn)
+        data, encode_seconds = encoded
+        posted = time.perf_counter()
  
         response = conn.session.post(endpoint, 
-                data=json.dumps(self.cmd_json), 
-                headers=headers
+                data=data, 
+                headers=headers,
+                stream=stream
                 )
+
+        timing = current_timing()
+        if timing is not None:
+            timing.add_request(operation_of(endpoint), len(data), encode_seconds, time.perf_counter() - posted)
+
+        if response.status_code == 401:
+            response.close()
+            raise InvalidSessionException('Session is not valid: HTTP 401 from {}'.format(endpoint))
                 
         response.raise_for_status()
+
+        return response
+
+    def _send_to(self, conn, endpoint):
+        response_cache = getattr(conn, 'response_cache', None)
+        if not self.READ_ONLY:
+            executed_result = self._execute(conn, endpoint)
+            if response_cache is not None and self.INVALIDATES:
+                response_cache.invalidate(*self.INVALIDATES)
+            return executed_result
+
+        single_flight = getattr(conn, 'single_flight', None)
+        if self.SESSION_SCOPED or (single_flight is None and response_cache is None):
+            return self._execute(conn, endpoint)
+
+        operation = operation_of(endpoint)
+        if response_cache is not None and response_cache.rule(operation) is None:
+            response_cache = None
+
+        #the body is encoded once, for its key and to be posted
+        encoded = self.encode(conn, sort_keys=True)
+        key = fingerprint(endpoint, encoded[0])
+        if response_cache is not None:
+            cached, executed_result = response_cache.get(operation, key)
+            if cached:
+                return executed_result
+
+        def execute():
+            executed_result = self._execute(conn, endpoint, encoded)
+            if response_cache is not None:
+                response_cache.put(operation, key, executed_result)
+            return executed_result
+
+        if single_flight is None:
+            return execute()
+
+        #an expired session is the leader's own, the others try theirs
+        return single_flight.do(key, execute, retry=(InvalidSessionException,))
+
+    def _execute(self, conn, endpoint, encoded=None):
+
+        response = self._post(conn, endpoint, encoded=encoded)
+        conn.record_response_bytes(endpoint, self.get_property_policy(conn) is not None, len(response.content))
         
-        executed_result = response.json()
+        #decode the bytes as received, no intermediate str
+        start = time.perf_counter()
+        executed_result = get_codec().loads(response.content)
+        check_service_exception(executed_result)
+
+        executed_result = compact_response(executed_result)
+
+        timing = current_timing()
+        if timing is not None:
+            timing.add_response(len(response.content), time.perf_counter() - start)
+        conn.object_store.ingest_response(executed_result)
         return executed_result
 
+    def _stream_to(self, conn, endpoint, arrays=(), maps=()):
+        '''
+        Returns a generator of the items of arrays and entries of maps in the
+        response, parsed as they are read, see codec.iter_stream. These are
+        not kept in the object store.
+
+        The response is read up to its first item before returning, so an
+        exception payload (an expired session is HTTP 200) raises here, while
+        the command is handled, not when the generator is consumed.
+        '''
+        response = self._post(conn, endpoint, stream=True)
+        response.raw.decode_content = True
+
+        stream = iter_stream(response.raw, arrays, maps, fields=EXCEPTION_FIELDS)
+        head = {}
+        first = None
+        try:
+            for event in stream:
+                if event[0] in EXCEPTION_FIELDS:
+                    head[event[0]] = event[2]
+                else:
+                    first = event
+                    break
+
+            check_service_exception(head)
+        except Exception:
+            response.close()
+            raise
+
+        def events():
+            with response:
+                if first is not None:
+                    yield first
+                for event in stream:
+                    if event[0] not in EXCEPTION_FIELDS:
+                        yield event
+
+        return events()
+
 
 class CreateItem(TcCommand):
+    INVALIDATES = ('getItemFromId', 'loadObjects')
 
     def set_cmd(self, name, description):
         
@@ -141,6 +341,7 @@ class CreateItem(TcCommand):
         return None
 
 class CreateAndRelateDataset(TcCommand):
+    INVALIDATES = ('expandGRMRelationsForPrimary', 'loadObjects')
 
     def set_cmd(self, container, dataset_name, description, dataset_type="HTML", relation_type="TC_Attaches"):
         self.cmd_json["body"] = {
@@ -168,6 +369,7 @@ class CreateAndRelateDataset(TcCommand):
         return executed_result["output"][0]
 
 class GetRelatedDatasets(TcCommand):
+    READ_ONLY = True
 
     def set_cmd(self, primary_obj, relation_type="TC_Attaches"):
         self.cmd_json["body"] = {
@@ -197,6 +399,7 @@ class GetRelatedDatasets(TcCommand):
         return result
 
 class CreateTraceLinks(TcCommand):
+    INVALIDATES = ('expandGRMRelationsForPrimary', 'loadObjects')
 
     def set_cmd(self, primary_obj, secondary_obj, relation_type="FND_TraceLink"):
         self.cmd_json["body"] = {
@@ -265,7 +468,22 @@ class Logout(TcCommand):
         
         return executed_result    
 
+class GetTCSessionInfo(TcCommand):
+    READ_ONLY = True
+    SESSION_SCOPED = True
+
+    def set_cmd(self):
+        self.cmd_json["body"] = { }
+            
+            
+    def send_to(self, conn, endpoint):
+
+        executed_result = self._send_to(conn, endpoint)
+        
+        return executed_result    
+
 class GetItemFromId(TcCommand):
+    READ_ONLY = True
 
     def set_cmd(self, itemid, itemrev, returnRev=True):
         self.returnRev = returnRev
@@ -298,8 +516,110 @@ class GetItemFromId(TcCommand):
             output = executed_result["output"][0]["item"]
             
         return executed_result["ServiceData"]["modelObjects"][output["uid"]]
+
+class GetItemsFromIds(TcCommand):
+    READ_ONLY = True
+    #items resolved per getItemFromId request
+    CHUNK_SIZE = 100
+
+    def set_cmd(self, item_strs, returnRev=True, chunk_size=None):
+        '''item_strs in form of ID_REV, example: REQ-00001_A'''
+        self.item_strs = list(item_strs)
+        self.returnRev = returnRev
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.missing = []
+
+        self.cmd_json["body"] = {
+                "infos": [],
+                "nRev": 0,
+                "pref": {
+                    "prefs": []
+                }
+            }
+
+    @staticmethod
+    def split_item_str(item_str):
+        '''(item id, revision) of ID_REV, None when malformed'''
+        parts = item_str.split(';')[0].rsplit('_', 1)
+        if len(parts) != 2 or not parts[0] or not parts[1]:
+            return None
+
+        return parts[0], parts[1]
+
+    def send_to(self, conn, endpoint):
+        #malformed ids are reported missing, as unknown ids, without failing the batch
+        result = dict.fromkeys(self.item_strs)
+        item_ids = dict((item_str, self.split_item_str(item_str)) for item_str in self.item_strs)
+        item_strs = [item_str for item_str in self.item_strs if item_ids[item_str] is not None]
+
+        for start in range(0, len(item_strs), self.chunk_size):
+            chunk = item_strs[start:start + self.chunk_size]
+
+            infos = []
+            for item_str in chunk:
+                itemid, itemrev = item_ids[item_str]
+                infos.append({"itemId": itemid, "revIds": [itemrev]})
+            self.cmd_json["body"]["infos"] = infos
+
+            executed_result = self._send_to(conn, endpoint)
+
+            found = self._match_chunk(chunk, executed_result)
+            for item_str in chunk:
+                result[item_str] = found.get(item_str)
+
+        self.missing = [item_str for item_str, model_obj in result.items() if model_obj is None]
+        return result
+
+    def _match_chunk(self, chunk, executed_result):
+        service_data = executed_result["ServiceData"]
+        model_objects = service_data.get("modelObjects", {})
+
+        outputs = []
+        for output in executed_result.get("output", []):
+            if self.returnRev:
+                output = output["itemRevOutput"]
+                if isinstance(output, list):
+                    if not output:
+                        continue
+                    output = output[0]["itemRevision"]
+            else:
+                output = output["item"]
+
+            outputs.append(model_objects.get(output["uid"], output))
+
+        #outputs keep input order, skipping the infos reported as partial errors
+        failed = set(pe.get("clientIndex") for pe in service_data.get("partialErrors", []))
+        resolved = [item_str for i, item_str in enumerate(chunk) if i not in failed]
+        if len(resolved) == len(outputs):
+            return dict(zip(resolved, outputs))
+
+        #otherwise match on object_string, ex: REQ-00001/A;Name
+        found = {}
+        for model_obj in outputs:
+            try:
+                part = model_obj["props"]["object_string"]["uiValues"][0].split(';')[0]
+            except (KeyError, IndexError):
+                continue
+            found['_'.join(part.rsplit('/', 1))] = model_obj
+
+        return dict((item_str, found.get(item_str.split(';')[0])) for item_str in chunk)
     
+class GetRevisionRules(TcCommand):
+    READ_ONLY = True
+
+    def set_cmd(self):
+        self.cmd_json["body"] = { }
+
+    def send_to(self, conn, endpoint):
+
+        get_rev_rules_result = self._send_to(conn, endpoint)
+
+        #the rules are the model objects having a name
+        return [mo for mo in get_rev_rules_result["ServiceData"]["modelObjects"].values()
+                if "object_name" in mo.get("props", {})]
+
 class GetRevisionRule(TcCommand):
+    READ_ONLY = True
 
     def set_cmd(self, rev_rule_name):
         self.rev_rule_name = rev_rule_name
@@ -307,6 +627,10 @@ class GetRevisionRule(TcCommand):
         self.cmd_json["body"] = { }
 
     def send_to(self, conn, endpoint):
+        #look up in the revision rules indexed for the alias
+        revision_rules = getattr(conn, 'revision_rules', None)
+        if revision_rules is not None:
+            return revision_rules.get(conn, self.rev_rule_name)
     
         get_rev_rules_result = self._send_to(conn, endpoint)
     
@@ -324,7 +648,13 @@ class GetRevisionRule(TcCommand):
 
 class CreateBOMWindow(TcCommand):
 
-    def set_cmd(self, itemrev_model_object, rev_rule):
+    def set_cmd(self, itemrev_model_object, rev_rule, date=None, unit_no=None):
+        '''
+        date and unit_no configure the effectivity of the revision rule,
+        date as datetime or Teamcenter date string, by default today
+        '''
+        if hasattr(date, 'isoformat'):
+            date = date.isoformat()
 
         self.cmd_json["body"] = {
                 "info": [
@@ -337,9 +667,9 @@ class CreateBOMWindow(TcCommand):
                             "clientId": "SIMULINK",
                             "revRule": rev_rule,
                             "props": {
-                                "unitNo": -1,
-                                "date": "",
-                                "today": True,
+                                "unitNo": -1 if unit_no is None else unit_no,
+                                "date": date or "",
+                                "today": not date,
                                 "endItem": "None2",
                                 "endItemRevision": "None2",
                                 "overrideFolders": [
@@ -364,6 +694,7 @@ class CreateBOMWindow(TcCommand):
         
         
 class ExpandGRMRelationsForPrimary(TcCommand):
+    READ_ONLY = True
 
     def set_cmd(self, primary_objs, relation_name='TC_Attaches'):
         self.cmd_json["body"] = {
@@ -386,8 +717,15 @@ class ExpandGRMRelationsForPrimary(TcCommand):
         return executed_result
 
 class ExpandPSAllLevels(TcCommand):
+    READ_ONLY = True
+
+    def set_cmd(self, bom_line, stream=False):
+        '''
+        stream: send_to yields ('output', None, parent/children record) and
+        ('ServiceData.modelObjects', uid, model object) while the response is parsed
+        '''
+        self.stream = stream
 
-    def set_cmd(self, bom_line):
         self.cmd_json["body"] = {
                 "input": {
                     "parentBomLines": [bom_line],
@@ -401,11 +739,16 @@ class ExpandPSAllLevels(TcCommand):
 
     def send_to(self, conn, endpoint):
 
+        if self.stream:
+            return self._stream_to(conn, endpoint,
+                                   arrays=('output',), maps=('ServiceData.modelObjects',))
+
         executed_result = self._send_to(conn, endpoint)
         
         return executed_result
 
 class DescribeSavedQueries(TcCommand):
+    READ_ONLY = True
 
     def set_cmd(self, query_objs):
         self.cmd_json["body"] = {
@@ -418,8 +761,7 @@ class DescribeSavedQueries(TcCommand):
         return executed_result
 
 class FindSavedQuery(TcCommand):
-    #known queries cacheing
-    _saved_queries = {}
+    READ_ONLY = True
 
     def set_cmd(self, saved_query_name):
         self.saved_query_name = saved_query_name
@@ -437,17 +779,13 @@ class FindSavedQuery(TcCommand):
 
     def send_to(self, conn, endpoint):
             
-        if self.saved_query_name not in self._saved_queries:
-            executed_result = self._send_to(conn, endpoint)
-
-            saved_query = executed_result["savedQueries"][0]
-            self._saved_queries[self.saved_query_name] = saved_query
-        else:
-            saved_query = self._saved_queries[self.saved_query_name]
+        #known queries are cached per alias, see cache.CACHE_RULES
+        executed_result = self._send_to(conn, endpoint)
 
-        return saved_query
+        return executed_result["savedQueries"][0]
         
 class ExecuteSavedQuery(TcCommand):
+    READ_ONLY = True
 
     def set_cmd(self, saved_query, entries, values, limit):
         self.cmd_json["body"] = {
@@ -469,8 +807,14 @@ class ExecuteSavedQuery(TcCommand):
         return tc_objs
         
 class GetProperties(TcCommand):
+    READ_ONLY = True
+
+    def set_cmd(self, tc_objs, attributes, from_store=False):
+        '''from_store: answered from the object store when all attributes are stored and fresh'''
+        self.tc_objs = tc_objs
+        self.attributes = attributes
+        self.from_store = from_store
 
-    def set_cmd(self, tc_objs, attributes):
         self.cmd_json["body"] = {
                 "objects": tc_objs,
                 "attributes":attributes
@@ -478,17 +822,44 @@ class GetProperties(TcCommand):
         
 
     def send_to(self, conn, endpoint):
+        if self.from_store:
+            uids = [tc_obj["uid"] for tc_obj in self.tc_objs]
+            model_objs = conn.object_store.get_many(uids, self.attributes)
+            if model_objs is not None:
+                return {"plain": uids,
+                        "modelObjects": dict(zip(uids, model_objs))}
+
         executed_result = self._send_to(conn, endpoint)
         
         return executed_result
         
 class GetHTML(TcCommand):
-    htmltextcache = {}
+    #html by item string, by alias name
+    htmltextcaches = {}
+
+    #image downloads in flight at once, shared by all exports
+    DOWNLOAD_WORKERS = 8
+    _download_executor = None
+    _download_lock = threading.Lock()
+
+    @classmethod
+    def download_executor(cls):
+        with cls._download_lock:
+            if cls._download_executor is None:
+                cls._download_executor = ThreadPoolExecutor(max_workers=cls.DOWNLOAD_WORKERS,
+                                                            thread_name_prefix='tc-download')
+        return cls._download_executor
+
+    @classmethod
+    def html_cache(cls, alias_name):
+        return cls.htmltextcaches.setdefault(alias_name, {})
     
     def set_cmd(self, item_strs, tc_objs):
 
         self.item_strs = item_strs
         self.tc_objs = tc_objs
+        self.image_count = 0
+        self.image_download_span = None
         
         self.cmd_json["body"] = {
                     "input": [
@@ -523,22 +894,48 @@ class GetHTML(TcCommand):
         #print(self.cmd_json["body"]["input"][0]["exportOptions"][0]["optionvalue"])
         executed_result = self._send_to(conn, endpoint)
         
-        #now cache the data per object
+        #now cache the data per object, images of all objects download in parallel
+        downloads = []
         for i in range(len(self.tc_objs)):
-            html = self.cache_html_text(conn, self.item_strs[i], self.tc_objs[i], executed_result["transientFileReadTickets"][i])
+            html = self.cache_html_text(conn, self.item_strs[i], self.tc_objs[i], executed_result["transientFileReadTickets"][i], downloads)
             htmls.append(html)
+
+        self.wait_downloads(downloads)
             
         return htmls
 
-
-    def cache_html_text(self, conn, item_str, tc_obj, escaped_html):
+    def wait_downloads(self, downloads):
+        spans = [download.result() for download in downloads]
+
+        self.image_count += len(spans)
+        if spans:
+            start = min(span[0] for span in spans)
+            end = max(span[1] for span in spans)
+            if self.image_download_span:
+                start = min(start, self.image_download_span[0])
+                end = max(end, self.image_download_span[1])
+            self.image_download_span = (start, end)
+
+    def cache_html_text(self, conn, item_str, tc_obj, escaped_html, downloads=None):
+        '''
+        Caches the html of tc_obj, saving its images to file.
+
+        Images in fms are downloaded in parallel; when a downloads list is
+        given their futures are added to it to be waited on by the caller,
+        otherwise they are waited on before returning.
+        '''
+        wait = downloads is None
+        if wait:
+            downloads = []
         
         unescaped_html = html.unescape(escaped_html)
 
+        #bs4 is imported on first use, it is slow to import
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(unescaped_html, 'html.parser')
 
         localpath = os.path.join('specimages',item_str)
-        folderpath = os.path.join(os.environ["LOCALAPPDATA"],'Temp/RMI/TEAMCENTER/',localpath)
+        folderpath = os.path.join(str(get_image_dir()), localpath)
         createdPath = pathlib.Path(folderpath).mkdir(parents=True, exist_ok=True)
 
         #remove the unnecessary requirement title in the text
@@ -556,12 +953,13 @@ class GetHTML(TcCommand):
                 
                 #save image stored in fms
                 if "fms/fmsdownload/" in img["src"]:
-                    fileext = img["src"].rsplit(".",1)[-1] 
+                    #the ticket is in the query, not part of the extension
+                    fileext = urllib.parse.urlsplit(img["src"]).path.rsplit(".",1)[-1]
                     
                     df = DownloadFile()
                     df.set_cmd(folderpath, filename + '.' + fileext, img["src"])
                     
-                    conn.handle(df)
+                    downloads.append(self.download_executor().submit(self._download, conn, df))
                 else:
                     raise
 
@@ -578,11 +976,22 @@ class GetHTML(TcCommand):
             img["src"] = lfilepath.replace("\\","/")
             i+=1
 
-        self.htmltextcache[item_str] =  str(soup)
+        html_text = self.html_cache(conn.alias.name)[item_str] =  str(soup)
+
+        if wait:
+            self.wait_downloads(downloads)
             
-        return self.htmltextcache[item_str]
+        return html_text
+
+    @staticmethod
+    def _download(conn, df):
+        start = time.perf_counter()
+        conn.handle(df)
+        return start, time.perf_counter()
 
 class DownloadFile(TcCommand):
+    #bytes written to file at a time
+    CHUNK_SIZE = 64 * 1024
 
     def set_cmd(self, folderpath, filename, url):   
         self.folderpath = folderpath
@@ -595,18 +1004,43 @@ class DownloadFile(TcCommand):
         
         local_filename = os.path.join(self.folderpath, self.filename)
 
-        urlretrieve(file_url, local_filename)
+        #keep-alive and cookies of the session, streamed to disk
+        start = time.perf_counter()
+        size = 0
+        with conn.session.get(file_url, stream=True) as response:
+            response.raise_for_status()
+
+            with open(local_filename, 'wb') as fp:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    fp.write(chunk)
+                    size += len(chunk)
+
+        timing = current_timing()
+        if timing is not None:
+            timing.add_request('fmsdownload', 0, 0.0, time.perf_counter() - start)
+            timing.add_response(size, 0.0)
         
         return local_filename
 
 
 class LoadObjects(TcCommand):
-    def set_cmd(self, uids):
+    READ_ONLY = True
+
+    def set_cmd(self, uids, props=None):
+        '''props: properties needed, if all are in the object store, and fresh, no request is sent'''
+        self.uids = uids
+        self.props = props
+
         self.cmd_json["body"] = {
             "uids": uids
         }  
 
     def send_to(self, conn, endpoint):
+        if self.props is not None:
+            plain_model_objs = conn.object_store.get_many(self.uids, self.props)
+            if plain_model_objs is not None:
+                return plain_model_objs
+
         executed_result = self._send_to(conn, endpoint)
         
         plain_objects = executed_result["plain"] #list[str]
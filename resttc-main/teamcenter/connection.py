@@ -29,38 +29,132 @@ __version__ = '0.1'
 __filename__ = 'connection.py'
 
 from json import JSONDecodeError
-import requests
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import os
-import sys
+import threading
+import time
 
 from teamcenter.handlers import HANDLERS
 from teamcenter.alias import get_alias
-from teamcenter.commands import get_command
-from teamcenter.credentials import get_credentials, set_credential_dir
+from teamcenter.commands import get_command, Login, Logout, InvalidSessionException
+from teamcenter.credentials import get_credentials, set_credential_dir, save_session, load_session, clear_session
+from teamcenter.datamodel import get_object_store
+from teamcenter.cache import get_single_flight, get_response_cache
+from teamcenter.revisionrules import get_revision_rule_index
+from teamcenter.metrics import get_metrics, start_timing, stop_timing
 
-if sys.exec_prefix:
-    set_credential_dir(sys.exec_prefix)
+#keep-alive connections to fms per session, for parallel downloads
+FMS_POOL_SIZE = 8
 
-class Singleton(type):
+#resume the session saved by a previous process instead of logging in, see enable_session_resume
+RESUME_SESSIONS = False
+
+#session headers saved with the cookies
+SESSION_HEADERS = ('X-XSRF-TOKEN', 'X-CSRFToken')
+
+#cookie telling apart the server sessions of an alias
+SESSION_COOKIE = 'JSESSIONID'
+
+def enable_session_resume(enabled=True):
+    global RESUME_SESSIONS
+
+    RESUME_SESSIONS = enabled
+
+#sessions created record to or replay from the cassette, see record_to and replay_from
+CASSETTE = None
+CASSETTE_ADAPTER = None
+
+def record_to(path, anonymize=False, compress=None):
+    '''
+    Records the requests and responses of the sessions created from now on
+    to a cassette file, compressed if its name ends with .gz, uids replaced
+    if anonymize
+    '''
+    global CASSETTE
+    global CASSETTE_ADAPTER
+    from teamcenter.cassette import Cassette, RecordingAdapter
+
+    stop_cassette()
+    CASSETTE = Cassette(path, anonymize=anonymize, compress=compress)
+    CASSETTE_ADAPTER = lambda: RecordingAdapter(CASSETTE, pool_maxsize=FMS_POOL_SIZE, pool_block=True)
+    return CASSETTE
+
+def replay_from(path, compress=None):
+    '''Sessions created from now on are answered from the cassette file, without a network'''
+    global CASSETTE
+    global CASSETTE_ADAPTER
+    from teamcenter.cassette import Cassette, ReplayAdapter
+
+    stop_cassette()
+    CASSETTE = Cassette.load(path, compress=compress)
+    adapter = ReplayAdapter(CASSETTE)
+    CASSETTE_ADAPTER = lambda: adapter
+    return CASSETTE
+
+def stop_cassette():
+    global CASSETTE
+    global CASSETTE_ADAPTER
+
+    if CASSETTE is not None:
+        CASSETTE.close()
+    CASSETTE = None
+    CASSETTE_ADAPTER = None
+
+def resolve_alias(alias=None):
+    '''The TcAlias of an alias name, the configured alias for None'''
+    if alias is None:
+        return get_configured_alias()
+    elif isinstance(alias, str):
+        return get_alias(alias)
+
+    return alias
+
+class AliasSingleton(type):
+    '''One instance per class and alias name'''
     _instances = {}
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+    _lock = threading.Lock()
+    def __call__(cls, alias=None, credentials=None):
+        alias = resolve_alias(alias)
+        key = (cls, alias.name)
+
+        with AliasSingleton._lock:
+            if key not in AliasSingleton._instances:
+                AliasSingleton._instances[key] = super(AliasSingleton, cls).__call__(alias, credentials)
 
-        return cls._instances[cls]
+            return AliasSingleton._instances[key]
 
-class TcConnection(metaclass=Singleton):
+class TcSession(object):
+    '''
+    A Teamcenter session: one requests.Session logged in for an alias.
+    Not shared, see TcConnection for the process wide connection and
+    TcConnectionPool for independently logged in sessions.
+    '''
     def __init__(self, alias=None, credentials=None):
         self.set_alias(alias)
         self.set_credentials(credentials)
+        self.object_store = get_object_store(self.alias.name)
+        self.single_flight = get_single_flight(self.alias.name)
+        self.response_cache = get_response_cache(self.alias.name)
+        self.revision_rules = get_revision_rule_index(self.alias.name)
+        self.metrics = get_metrics(self.alias.name)
+        self.property_policy = None
         self.logged_in = False       
 
+        #keep-alive connections to the web tier, when more threads share this session than requests keeps
+        self.web_pool_size = None
+
+        #logins of this session, to login again only once when it expires
+        self._login_lock = threading.RLock()
+        self._login_generation = 0
+        self.relogins = 0
+
+        #response bytes by endpoint, with default properties and with a policy
+        self._response_bytes = {}
+        self._response_bytes_lock = threading.Lock()
+
     def set_alias(self, alias=None):
-        global SET_ALIAS
-        if alias is None:
-            self.alias = SET_ALIAS
-        else:
-            self.alias = alias
+        self.alias = resolve_alias(alias)
 
     def set_credentials(self, credentials=None):
         if credentials:
@@ -68,67 +162,553 @@ class TcConnection(metaclass=Singleton):
         else:
             self.credentials = get_credentials(self.alias.name)
 
+    def set_property_policy(self, policy):
+        '''PropertyPolicy for all commands without a policy of their own, None for the server default'''
+        self.property_policy = policy
+
+    def record_response_bytes(self, endpoint, with_policy, size):
+        with self._response_bytes_lock:
+            counts = self._response_bytes.setdefault(endpoint, {False: [0, 0], True: [0, 0]})
+            counts[with_policy][0] += 1
+            counts[with_policy][1] += size
+
+    def policy_report(self):
+        '''
+        Per endpoint, the average response bytes with the default properties
+        and with a property policy, and the bytes saved by the policy for the
+        responses received with it (when both have been seen)
+        '''
+        report = {}
+        with self._response_bytes_lock:
+            for endpoint, counts in self._response_bytes.items():
+                (default_count, default_bytes), (policy_count, policy_bytes) = counts[False], counts[True]
+
+                default_avg = default_bytes / default_count if default_count else None
+                policy_avg = policy_bytes / policy_count if policy_count else None
+
+                saved = None
+                if default_avg is not None and policy_avg is not None:
+                    saved = int((default_avg - policy_avg) * policy_count)
+
+                report[endpoint] = {"default_avg_bytes": default_avg,
+                                    "policy_avg_bytes": policy_avg,
+                                    "policy_responses": policy_count,
+                                    "bytes_saved": saved}
+
+        return report
+
     def handle(self, cmd):
+        outer = start_timing(type(cmd).__name__)
+        start = time.perf_counter()
+        error = None
+        try:
+            return self._handle(cmd)
+
+        except Exception as e:
+            error = e
+            raise
+
+        finally:
+            timing = stop_timing(outer)
+            if timing is not None:
+                self.metrics.record(timing, time.perf_counter() - start, error)
+
+    def _handle(self, cmd):
         handler = HANDLERS.get(type(cmd))
 
-        return handler(self, cmd)
+        generation = self._login_generation
+        try:
+            return handler(self, cmd)
+
+        except InvalidSessionException:
+            if isinstance(cmd, (Login, Logout)) or not self.logged_in:
+                raise
+
+            #session expired: login again and replay the command once
+            self.relogin(generation)
+            return handler(self, cmd)
+
+    def stats(self):
+        '''Snapshot of the metrics of the commands handled for the alias, see metrics.Metrics'''
+        return self.metrics.snapshot()
+
+    def relogin(self, generation):
+        '''
+        Logs in again if still at the login generation found expired, threads
+        finding the same expiry wait for the first one to login. With
+        RESUME_SESSIONS the new session replaces the expired one if saved
+        '''
+        with self._login_lock:
+            if self._login_generation == generation:
+                resaves = RESUME_SESSIONS and self.owns_saved_session()
+                self.login(resume=False)
+                self.relogins += 1
+
+                if resaves:
+                    self.save_session()
+
+    def handle_many(self, cmds, max_concurrency=4):
+        '''
+        Handles commands concurrently over pooled sessions of this alias.
+
+        Results are returned in the order of cmds. A failing command does not
+        abort the batch, its exception is returned in place of its result.
+        '''
+        cmds = list(cmds)
+        if not cmds:
+            return []
+
+        pool = get_pool(self.alias, max_size=max_concurrency,
+                        credentials=self.credentials)
+
+        def run(cmd):
+            #pooled sessions answer with the properties of this connection, for this call only
+            with pool.connection() as conn:
+                policy = conn.property_policy
+                conn.set_property_policy(self.property_policy)
+                try:
+                    return conn.handle(cmd)
+                finally:
+                    conn.set_property_policy(policy)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(cmds)),
+                                thread_name_prefix='tc-batch') as executor:
+            futures = [executor.submit(run, cmd) for cmd in cmds]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+
+        return results
+
+    def new_session(self):
+        #requests is imported with the first session, not with this module
+        import requests
+        import requests.adapters
 
-    def login(self):
         self.session = requests.Session()
+        if CASSETTE_ADAPTER is not None:
+            adapter = CASSETTE_ADAPTER()
+            for prefix in ('http://', 'https://', self.alias.get_fms_url()):
+                self.session.mount(prefix, adapter)
+            return
+
+        self.session.mount(self.alias.get_fms_url(),
+                           requests.adapters.HTTPAdapter(pool_maxsize=FMS_POOL_SIZE, pool_block=True))
+        if self.web_pool_size:
+            self.session.mount(self.alias.get_base_url(),
+                               requests.adapters.HTTPAdapter(pool_maxsize=self.web_pool_size))
+
+    def login(self, resume=None):
+        '''
+        Logs in, or with resume (default RESUME_SESSIONS) first tries to
+        resume the session saved for the alias, saving it after logging in
+        '''
+        if resume is None:
+            resume = RESUME_SESSIONS
+
+        with self._login_lock:
+            if resume and self.resume_session():
+                self.logged_in = True
+                self._login_generation += 1
+                return None
+
+            self.new_session()
+
+            li = get_command('Login')
+            li.set_cmd(self.credentials.username,
+                        self.credentials.password)
+            result= self.handle(li)
+            self.logged_in = True
+            self._login_generation += 1
+
+            if resume:
+                self.save_session()
 
-        li = get_command('Login')
-        li.set_cmd(self.credentials.username,
-                    self.credentials.password)
-        result= self.handle(li)
-        self.logged_in = True
         return result
 
+    def save_session(self):
+        state = {
+            "url": self.alias.get_base_url(),
+            "cookies": [{"name": c.name, "value": c.value, "domain": c.domain,
+                         "path": c.path, "secure": c.secure, "expires": c.expires}
+                        for c in self.session.cookies],
+            "headers": dict((name, self.session.headers[name])
+                            for name in SESSION_HEADERS if name in self.session.headers),
+        }
+        try:
+            save_session(self.alias.name, state)
+        except Exception:
+            pass
+
+    def resume_session(self):
+        '''Resumes the saved session if still valid on the server'''
+        state = load_session(self.alias.name)
+        if not state or state.get("url") != self.alias.get_base_url():
+            return False
+
+        self.new_session()
+        for cookie in state["cookies"]:
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"],
+                                     path=cookie["path"], secure=cookie["secure"], expires=cookie["expires"])
+        self.session.headers.update(state["headers"])
+
+        #cheap call to validate the session
+        gsi = get_command('GetTCSessionInfo')
+        gsi.set_cmd()
+        try:
+            self.handle(gsi)
+        except Exception:
+            clear_session(self.alias.name)
+            return False
+
+        return True
+
+    def owns_saved_session(self):
+        '''True if the session saved for the alias is the one of this TcSession'''
+        session = getattr(self, 'session', None)
+        if session is None:
+            return False
+
+        state = load_session(self.alias.name)
+        if not state:
+            return False
+
+        saved = [c["value"] for c in state["cookies"] if c["name"] == SESSION_COOKIE]
+        current = [c.value for c in session.cookies if c.name == SESSION_COOKIE]
+        return bool(saved) and saved == current
+
     def logout(self):
         lo = get_command('Logout')
         lo.set_cmd()
-        result = self.handle(lo)
-        self.close()
-        return result
+        #other sessions of the alias, pooled or warming up, leave the saved one be
+        owns_saved = self.owns_saved_session()
+        try:
+            return self.handle(lo)
+        except InvalidSessionException:
+            #expired on the server already, nothing left to log out
+            return None
+        finally:
+            self.close()
+            if owns_saved:
+                clear_session(self.alias.name)
+
+    def adopt(self, other):
+        '''
+        Takes over the logged in session of another TcSession of the alias,
+        unless logged in already
+        '''
+        with self._login_lock:
+            if self.logged_in:
+                return False
+
+            self.session, other.session = other.session, None
+            other.logged_in = False
+            self.logged_in = True
+            self._login_generation += 1
+
+        return True
 
     def close(self):
-        self.session.cookies.clear()
-        self.session.close()
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.cookies.clear()
+            session.close()
         self.logged_in = False
         
     def __del__(self):
         try:
             self.close()
         except: pass
-        
-SET_ALIAS =  get_alias('DEFAULT')
+
+class TcConnection(TcSession, metaclass=AliasSingleton):
+    '''
+    The process wide connection of an alias, one per alias so several
+    Teamcenter servers can be used at once, see get_connection
+    '''
+    pass
+
+class PoolExhausted(Exception): pass
+
+class PoolClosed(Exception): pass
+
+class TcConnectionPool(object):
+    '''
+    Pool of independently logged in sessions for one alias.
+
+    Sessions are created and logged in on demand up to max_size, a checkout
+    beyond that waits for a checkin (or raises PoolExhausted on timeout).
+    '''
+    def __init__(self, alias=None, credentials=None, max_size=4, timeout=None):
+        self.alias = resolve_alias(alias)
+        self.credentials = credentials
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def size(self):
+        return self._size
+
+    def grow(self, max_size):
+        '''Raises max_size, checkouts waiting may then create sessions'''
+        with self._cond:
+            if max_size > self.max_size:
+                self.max_size = max_size
+                self._cond.notify_all()
+
+    def checkout(self, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolClosed('Connection pool is closed for alias: {}'.format(self.alias.name))
+
+                if self._idle:
+                    return self._idle.pop()
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhausted('No session available for alias: {}'.format(self.alias.name))
+
+                self._cond.wait(remaining)
+
+        #login outside of the lock, other checkouts may proceed meanwhile
+        try:
+            if self.credentials is None:
+                self.credentials = get_credentials(self.alias.name)
+
+            conn = TcSession(self.alias, self.credentials)
+            conn.login(resume=False)
+        except:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        return conn
+
+    def checkin(self, conn):
+        with self._cond:
+            if self._closed or not conn.logged_in:
+                self._size -= 1
+                discard = True
+            else:
+                self._idle.append(conn)
+                discard = False
+
+            self._cond.notify()
+
+        if discard:
+            try:
+                conn.close()
+            except: pass
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def close(self, logout=True):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn in idle:
+            try:
+                if logout:
+                    conn.logout()
+                else:
+                    conn.close()
+            except: pass
+
+#the DEFAULT alias is read from tcaliases.ini when first needed
+SET_ALIAS = None
 def config_alias(alias = 'DEFAULT'):
     global SET_ALIAS
     
-    SET_ALIAS = get_alias(alias)
-    
-    
-def create_connection(alias):
-    global SET_ALIAS
+    SET_ALIAS = resolve_alias(alias)
 
-    if alias:
-        #use the provided
-        conn = TcConnection(alias)
-        
-    else:
-        #use the configured
-        conn = TcConnection(SET_ALIAS)
+def get_configured_alias():
+    global SET_ALIAS
 
-    return conn
+    if SET_ALIAS is None:
+        SET_ALIAS = get_alias('DEFAULT')
+    return SET_ALIAS
     
-#use only one connection, logged in only once for matlab (performance)
+    
+def create_connection(alias=None):
+    #the provided, or the configured
+    return TcConnection(alias)
+    
+#use only one connection per alias, logged in only once for matlab (performance)
 def get_connection(alias=None):
+    #a warm-up in progress logs in and fills the caches, wait for it instead of racing it,
+    #but not longer than WARM_UP_TIMEOUT: a hung warm-up does not hold the login lock
+    warming_up = get_warm_up(alias)
+    if warming_up is not None:
+        warming_up.wait(WARM_UP_TIMEOUT)
+
     conn = create_connection(alias)
     
     if not conn.logged_in:
-        conn.login()
+        with conn._login_lock:
+            if not conn.logged_in:
+                conn.login()
         
     return conn
     
-def reset_connection():
-    conn = get_connection()
+#revision rules and saved queries resolved by warm_up, MATLAB looks up these
+WARM_UP_REVISION_RULES = ('Latest Working',)
+WARM_UP_SAVED_QUERIES = ('Item Revision...',)
+
+#seconds get_connection waits for a warm-up before logging in itself
+WARM_UP_TIMEOUT = 30
+
+class WarmUp(object):
+    '''
+    Logs in the connection of an alias on a background thread, on its
+    keep-alive connection to the web tier, and resolves revision rules and
+    saved queries into the per alias caches, so the first command finds a
+    hot connection. Errors are kept in error: the first command logs in,
+    or fails, itself.
+
+    The login is done on a session of its own, adopted by the connection
+    unless the connection logged in meanwhile (see WARM_UP_TIMEOUT).
+    '''
+    def __init__(self, alias, revision_rules=WARM_UP_REVISION_RULES, saved_queries=WARM_UP_SAVED_QUERIES):
+        self.alias = alias
+        self.revision_rules = revision_rules
+        self.saved_queries = saved_queries
+        self.error = None
+        self.elapsed = None
+        self._thread = threading.Thread(target=self._run, name='tc-warm-up-' + alias.name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            conn = create_connection(self.alias)
+            if not conn.logged_in:
+                session = TcSession(conn.alias, conn.credentials)
+                session.login()
+                if not conn.adopt(session):
+                    session.logout()
+
+            for rev_rule_name in self.revision_rules:
+                conn.revision_rules.get(conn, rev_rule_name)
+
+            for saved_query_name in self.saved_queries:
+                fsq = get_command('FindSavedQuery')
+                fsq.set_cmd(saved_query_name)
+                conn.handle(fsq)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        '''Waits for the warm-up to finish, unless called from the warm-up itself'''
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+        return not self.running
+
+WARM_UPS = {}
+_WARM_UPS_LOCK = threading.Lock()
+def warm_up(alias=None, revision_rules=WARM_UP_REVISION_RULES, saved_queries=WARM_UP_SAVED_QUERIES):
+    '''
+    Starts the WarmUp of the connection of the alias, unless one is running
+    or has logged the connection in already
+    '''
+    alias = resolve_alias(alias)
+
+    with _WARM_UPS_LOCK:
+        warming_up = WARM_UPS.get(alias.name)
+        if warming_up is not None:
+            conn = get_connections().get(alias.name)
+            if warming_up.running or (conn is not None and conn.logged_in):
+                return warming_up
+
+        warming_up = WARM_UPS[alias.name] = WarmUp(alias, revision_rules, saved_queries).start()
+
+    return warming_up
+
+def get_warm_up(alias=None):
+    '''The WarmUp started for the alias, if any'''
+    alias_name = alias if isinstance(alias, str) else resolve_alias(alias).name
+
+    with _WARM_UPS_LOCK:
+        return WARM_UPS.get(alias_name)
+
+def reset_connection(alias=None):
+    conn = get_connection(alias)
     conn.logout()
+
+def get_connections():
+    '''The connections created, by alias name'''
+    with AliasSingleton._lock:
+        return dict((alias_name, conn) for (cls, alias_name), conn in AliasSingleton._instances.items()
+                    if cls is TcConnection)
+
+def close_connections(logout=True):
+    with AliasSingleton._lock:
+        keys = [key for key in AliasSingleton._instances if key[0] is TcConnection]
+        conns = [AliasSingleton._instances.pop(key) for key in keys]
+
+    for conn in conns:
+        try:
+            if logout and conn.logged_in:
+                conn.logout()
+            else:
+                conn.close()
+        except: pass
+
+POOLS = {}
+_POOLS_LOCK = threading.Lock()
+def get_pool(alias=None, max_size=4, credentials=None):
+    alias = resolve_alias(alias)
+
+    with _POOLS_LOCK:
+        pool = POOLS.get(alias.name)
+        if pool is None or pool._closed:
+            pool = POOLS[alias.name] = TcConnectionPool(alias, credentials, max_size=max_size)
+        else:
+            #shared by the callers of the alias, sized for the largest
+            pool.grow(max_size)
+
+    return pool
+
+def close_pools():
+    with _POOLS_LOCK:
+        pools = list(POOLS.values())
+        POOLS.clear()
+
+    for pool in pools:
+        pool.close()
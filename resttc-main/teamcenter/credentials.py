@@ -27,9 +27,10 @@ __license__ = '''
 __authors__ = 'Jason Wickers <jason.wickers@siemens.com'
 __version__ = '0.1'
 __filename__ = 'credentials.py'
+import json
+import os
 import sys
 from pathlib import Path, PurePath
-from cryptography.fernet import Fernet
 
 CREDENTIAL_DIR = None
 if sys.exec_prefix:
@@ -40,6 +41,11 @@ def set_credential_dir(python_home):
 
     CREDENTIAL_DIR = PurePath(python_home, 'teamcenter')
 
+def _fernet(key):
+    #cryptography is slow to import, only imported to decrypt or encrypt
+    from cryptography.fernet import Fernet
+    return Fernet(key)
+
 class TcCredentials(object):
 
     def __init__(self, alias, credentials):
@@ -55,7 +61,7 @@ class TcCredentials(object):
         
     @property
     def password(self):
-        f = Fernet(self.__key)
+        f = _fernet(self.__key)
         epasswd = self.__credentials['Password']
         
         passwd = f.decrypt(epasswd.encode()).decode()
@@ -82,8 +88,6 @@ def get_credentials(alias):
     if not cf.is_file():
         raise Exception('Credential file does not exist for alias: {}'.format(alias))
      
-    key = get_key(alias)
-    f = Fernet(key)
     with open(cred_filename,'r') as cred_in:
         lines = cred_in.readlines()
         credentials = {}
@@ -93,4 +97,37 @@ def get_credentials(alias):
                 credentials[tuples[0]] = tuples[1]
      
     return TcCredentials(alias, credentials)
-    
\ No newline at end of file
+    
+
+def get_session_file(alias):
+    global CREDENTIAL_DIR
+    return PurePath(CREDENTIAL_DIR, alias + '_Session.dat')
+
+def save_session(alias, session_state):
+    """Saves session cookies and headers encrypted with the key of the alias"""
+    f = _fernet(get_key(alias))
+    token = f.encrypt(json.dumps(session_state).encode())
+
+    session_file = str(get_session_file(alias))
+    with open(session_file + '.tmp', 'wb') as session_out:
+        session_out.write(token)
+    os.replace(session_file + '.tmp', session_file)
+
+def load_session(alias):
+    """The saved session state of the alias, None if none or not readable"""
+    sf = Path(get_session_file(alias))
+    if not sf.is_file():
+        return None
+
+    try:
+        f = _fernet(get_key(alias))
+        with open(str(sf), 'rb') as session_in:
+            return json.loads(f.decrypt(session_in.read()).decode())
+    except Exception:
+        return None
+
+def clear_session(alias):
+    try:
+        os.remove(str(get_session_file(alias)))
+    except OSError:
+        pass
@@ -0,0 +1,300 @@
+"""
+    Client side store of the Teamcenter model objects received in responses
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'datamodel.py'
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+DEFAULT_STORE_SIZE = 100000
+
+#seconds a stored object answers for the server, as the loadObjects cache rule
+OBJECT_MAX_AGE = 30
+
+#keep model objects of responses as ModelObject instead of nested dicts
+COMPACT_MODEL_OBJECTS = True
+
+#values up to this length are interned, users, dates and states repeat a lot
+INTERN_MAX_LENGTH = 64
+
+_MISSING = object()
+
+class Property(Mapping):
+    '''
+    A property of a model object with dict-like access to dbValues and
+    uiValues, other keys of the property are kept as received
+    '''
+    __slots__ = ('dbValues', 'uiValues', '_extra')
+
+    def __init__(self, value):
+        self.dbValues = _intern_values(value.get('dbValues', _MISSING))
+        self.uiValues = _intern_values(value.get('uiValues', _MISSING))
+
+        extra = None
+        if len(value) > (self.dbValues is not _MISSING) + (self.uiValues is not _MISSING):
+            extra = dict((key, item) for key, item in value.items() if key not in ('dbValues', 'uiValues'))
+        self._extra = extra
+
+    def __getitem__(self, key):
+        if key == 'uiValues' or key == 'dbValues':
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __iter__(self):
+        if self.dbValues is not _MISSING:
+            yield 'dbValues'
+        if self.uiValues is not _MISSING:
+            yield 'uiValues'
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_json(self):
+        return dict(self)
+
+class ModelObject(Mapping):
+    '''
+    A model object with dict-like access, as in the responses: uid, className,
+    type and props by name. Names and types are interned and props are kept
+    as Property, only when the object has any.
+    '''
+    __slots__ = ('uid', 'className', 'type', '_props', '_extra')
+
+    KEYS = ('uid', 'className', 'type')
+
+    def __init__(self, value):
+        self.uid = value.get('uid')
+        self.className = _intern(value.get('className', _MISSING))
+        self.type = _intern(value.get('type', _MISSING))
+
+        props = value.get('props')
+        self._props = None if props is None else self._compact_props(props)
+
+        extra = None
+        for key, item in value.items():
+            if key not in ('uid', 'className', 'type', 'props'):
+                if extra is None:
+                    extra = {}
+                extra[key] = item
+        self._extra = extra
+
+    @staticmethod
+    def _compact_props(props):
+        return dict((sys.intern(name), value if isinstance(value, Property) else Property(value))
+                    for name, value in props.items())
+
+    @classmethod
+    def from_json(cls, value):
+        return value if isinstance(value, ModelObject) else cls(value)
+
+    def __getitem__(self, key):
+        if key == 'props':
+            if self._props is not None:
+                return self._props
+        elif key in self.KEYS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'uid'
+        if self.className is not _MISSING:
+            yield 'className'
+        if self.type is not _MISSING:
+            yield 'type'
+        if self._props is not None:
+            yield 'props'
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return 'ModelObject({!r}, {!r})'.format(self.uid, self.get('type'))
+
+    def merge(self, other):
+        '''Updates with the values of another model object, merging props'''
+        for key in ('className', 'type'):
+            value = other.get(key, _MISSING)
+            if value is not _MISSING:
+                setattr(self, key, _intern(value))
+
+        props = other.get('props')
+        if props is not None:
+            if self._props is None:
+                self._props = {}
+            self._props.update(self._compact_props(props))
+
+        for key, item in other.items():
+            if key not in ('uid', 'className', 'type', 'props'):
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = item
+
+    def to_json(self):
+        value = dict(self)
+        if self._props is not None:
+            value['props'] = dict((name, prop.to_json()) for name, prop in self._props.items())
+        return value
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _intern_values(values):
+    if isinstance(values, list):
+        for i, value in enumerate(values):
+            if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+                values[i] = sys.intern(value)
+    return values
+
+def compact_response(executed_result):
+    '''Replaces the model objects of the response ServiceData with ModelObject, in place'''
+    if not COMPACT_MODEL_OBJECTS or not isinstance(executed_result, dict):
+        return executed_result
+
+    service_data = executed_result.get("ServiceData", executed_result)
+    model_objects = service_data.get("modelObjects") if isinstance(service_data, dict) else None
+    if model_objects:
+        for uid, model_obj in model_objects.items():
+            if isinstance(model_obj, dict):
+                model_objects[uid] = ModelObject(model_obj)
+
+    return executed_result
+
+class ObjectStore(object):
+    '''
+    Model objects by uid, merging the props of every response (like the SOA
+    ClientDataModel). Least recently used objects are evicted beyond max_size,
+    and objects not received for max_age seconds are not answered anymore.
+    '''
+    def __init__(self, max_size=DEFAULT_STORE_SIZE, max_age=None):
+        self.max_size = max_size
+        self.max_age = OBJECT_MAX_AGE if max_age is None else max_age
+        self._objects = OrderedDict()
+        self._received_at = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, uid):
+        return uid in self._objects
+
+    def ingest(self, model_objects):
+        now = time.monotonic()
+        with self._lock:
+            for uid, model_obj in model_objects.items():
+                self._received_at[uid] = now
+                stored = self._objects.get(uid)
+                if stored is None:
+                    self._objects[uid] = ModelObject.from_json(model_obj)
+                else:
+                    if stored is not model_obj:
+                        stored.merge(model_obj)
+                    self._objects.move_to_end(uid)
+
+            while len(self._objects) > self.max_size:
+                uid, _ = self._objects.popitem(last=False)
+                self._received_at.pop(uid, None)
+
+    def ingest_response(self, executed_result):
+        if not isinstance(executed_result, dict):
+            return
+
+        #service data is nested in most responses, loadObjects returns it as is
+        service_data = executed_result.get("ServiceData", executed_result)
+        model_objects = service_data.get("modelObjects")
+        if model_objects:
+            self.ingest(model_objects)
+
+    def get(self, uid, props=()):
+        '''The stored object if received within max_age and it has all props, otherwise None'''
+        with self._lock:
+            model_obj = self._objects.get(uid)
+            if model_obj is None:
+                return None
+
+            if time.monotonic() - self._received_at[uid] > self.max_age:
+                return None
+
+            #objects first seen in responses without props have none
+            stored_props = model_obj.get("props", {})
+            for prop in props:
+                if prop not in stored_props:
+                    return None
+
+            self._objects.move_to_end(uid)
+            return model_obj
+
+    def get_many(self, uids, props=()):
+        '''The stored objects aligned with uids if all of them have all props, otherwise None'''
+        with self._lock:
+            model_objs = []
+            for uid in uids:
+                model_obj = self.get(uid, props)
+                if model_obj is None:
+                    return None
+                model_objs.append(model_obj)
+
+            return model_objs
+
+    def invalidate(self, uids):
+        with self._lock:
+            for uid in uids:
+                self._objects.pop(uid, None)
+                self._received_at.pop(uid, None)
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
+            self._received_at.clear()
+
+
+OBJECT_STORES = {}
+_STORES_LOCK = threading.Lock()
+def get_object_store(alias_name):
+    with _STORES_LOCK:
+        store = OBJECT_STORES.get(alias_name)
+        if store is None:
+            store = OBJECT_STORES[alias_name] = ObjectStore()
+
+    return store
@@ -34,18 +34,21 @@ import teamcenter.commands as cmd
 HANDLERS = {
     cmd.Login : svc.Session.login,
     cmd.Logout : svc.Session.logout,
+    cmd.GetTCSessionInfo : svc.Session.get_tc_session_info,
     cmd.FindSavedQuery : svc.SavedQuery.find_saved_queries,
     cmd.DescribeSavedQueries : svc.SavedQuery.describe_saved_queries,
     cmd.ExecuteSavedQuery : svc.SavedQuery.execute_saved_query,
     cmd.LoadObjects : svc.DataManagement.load_objects,
     cmd.GetProperties : svc.DataManagement.get_properties,
     cmd.GetItemFromId : svc.DataManagement.get_item_from_id,
+    cmd.GetItemsFromIds : svc.DataManagement.get_item_from_id,
     cmd.ExpandGRMRelationsForPrimary : svc.DataManagement.expand_grm_relations_for_primary,
     cmd.GetRelatedDatasets : svc.DataManagement.expand_grm_relations_for_primary,
     cmd.CreateAndRelateDataset : svc.DataManagement.create_datasets2,
     cmd.CreateBOMWindow : svc.StructureManagement.create_bom_windows,
     cmd.ExpandPSAllLevels : svc.StructureManagement.expand_ps_all_levels,
     cmd.GetRevisionRule : svc.StructureManagement.get_revision_rules,
+    cmd.GetRevisionRules : svc.StructureManagement.get_revision_rules,
     cmd.CreateTraceLinks : svc.RequirementsManagement.create_tracelinks,
     cmd.GetHTML : svc.RequirementsManagement.export_to_application3,
     cmd.DownloadFile : svc.FMSClient.download_file,
@@ -1,6 +1,17 @@
+function Teamcenter_Integration(warmUp)
+% Registers the Teamcenter link type. Teamcenter_Integration(true) also logs in to
+% Teamcenter in the background, so the first link operation finds a hot connection.
+if nargin < 1
+    warmUp = false;
+end
 warning('off','all');
 rmi('unregister','linktype_rmi_teamcenter');
 warning('on','all');
 rmi('register','linktype_rmi_teamcenter');
 rmipref('StoreDataExternally',true);
-disp('Teamcenter Integration Initialized.')
\ No newline at end of file
+if warmUp
+    pythonenv = pyenv();
+    py.teamcenter.init_python(pythonenv.Home, pyargs('warm_up', true));
+end
+disp('Teamcenter Integration Initialized.')
+end
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+    Timing, payload size and error metrics of the commands handled
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'metrics.py'
+
+import bisect
+import threading
+import time
+
+#commands are timed and measured in handle, see enable_metrics
+METRICS_ENABLED = True
+
+def enable_metrics(enabled=True):
+    global METRICS_ENABLED
+
+    METRICS_ENABLED = enabled
+
+def exponential_bounds(start, factor, count):
+    return tuple(start * factor ** i for i in range(count))
+
+#upper bounds of the histogram buckets, in seconds and in bytes
+TIME_BOUNDS = exponential_bounds(0.0005, 2, 18)
+BYTES_BOUNDS = exponential_bounds(256, 4, 12)
+
+class Histogram(object):
+    '''
+    Counts of values by bucket, plus their count, sum, min and max.
+    Percentiles are estimated as the upper bound of their bucket.
+    '''
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": [[bound, count] for bound, count in zip(self.bounds + (None,), self.counts) if count],
+        }
+
+class Timing(object):
+    '''
+    Measures of one command being handled: the requests it sent, their
+    bytes and the time spent serializing, on the network and parsing
+    '''
+    __slots__ = ('command', 'operation', 'requests', 'request_bytes', 'response_bytes',
+                 'serialize', 'network', 'parse')
+
+    def __init__(self, command):
+        self.command = command
+        self.operation = None
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.serialize = 0.0
+        self.network = 0.0
+        self.parse = 0.0
+
+    def add_request(self, operation, request_bytes, serialize, network):
+        self.operation = operation
+        self.requests += 1
+        self.request_bytes += request_bytes
+        self.serialize += serialize
+        self.network += network
+
+    def add_response(self, response_bytes, parse):
+        self.response_bytes += response_bytes
+        self.parse += parse
+
+_local = threading.local()
+
+def current_timing():
+    '''Timing of the command handled on this thread, None if not measured'''
+    return getattr(_local, 'timing', None)
+
+def start_timing(command):
+    '''Starts the timing of a command, returns the timing it nests in to be restored'''
+    outer = current_timing()
+    _local.timing = Timing(command) if METRICS_ENABLED else None
+    return outer
+
+def stop_timing(outer):
+    timing = current_timing()
+    _local.timing = outer
+    return timing
+
+MEASURES = ('total', 'serialize', 'network', 'parse', 'process', 'request_bytes', 'response_bytes')
+
+class CommandMetrics(object):
+    def __init__(self):
+        self.calls = 0
+        self.requests = 0
+        self.errors = {}
+        self.histograms = dict((measure, Histogram(BYTES_BOUNDS if measure.endswith('_bytes') else TIME_BOUNDS))
+                               for measure in MEASURES)
+
+    def snapshot(self):
+        return {
+            "calls": self.calls,
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "histograms": dict((measure, histogram.snapshot()) for measure, histogram in self.histograms.items()),
+        }
+
+class Metrics(object):
+    '''
+    Histograms of the commands handled, by command class and operation of
+    the endpoint: total time, time serializing requests, on the network,
+    parsing responses and processing them in send_to, and bytes sent and
+    received. Commands answered without a request have operation None.
+    '''
+    def __init__(self):
+        self._commands = {}
+        self._lock = threading.Lock()
+
+    def record(self, timing, total, error=None):
+        with self._lock:
+            command_metrics = self._commands.get((timing.command, timing.operation))
+            if command_metrics is None:
+                command_metrics = self._commands[(timing.command, timing.operation)] = CommandMetrics()
+
+            command_metrics.calls += 1
+            command_metrics.requests += timing.requests
+            if error is not None:
+                name = type(error).__name__
+                command_metrics.errors[name] = command_metrics.errors.get(name, 0) + 1
+
+            histograms = command_metrics.histograms
+            histograms["total"].add(total)
+            histograms["process"].add(max(total - timing.serialize - timing.network - timing.parse, 0.0))
+            if timing.requests:
+                histograms["serialize"].add(timing.serialize)
+                histograms["network"].add(timing.network)
+                histograms["parse"].add(timing.parse)
+                histograms["request_bytes"].add(timing.request_bytes)
+                histograms["response_bytes"].add(timing.response_bytes)
+
+    def snapshot(self):
+        '''Metrics by command class name then operation'''
+        with self._lock:
+            stats = {}
+            for (command, operation), command_metrics in self._commands.items():
+                stats.setdefault(command, {})[operation] = command_metrics.snapshot()
+            return stats
+
+    def clear(self):
+        with self._lock:
+            self._commands.clear()
+
+
+METRICS = {}
+_METRICS_LOCK = threading.Lock()
+def get_metrics(alias_name):
+    with _METRICS_LOCK:
+        metrics = METRICS.get(alias_name)
+        if metrics is None:
+            metrics = METRICS[alias_name] = Metrics()
+
+    return metrics
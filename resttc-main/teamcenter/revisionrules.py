@@ -0,0 +1,122 @@
+"""
+    Index of the revision rules of a Teamcenter server
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'revisionrules.py'
+
+import threading
+import time
+
+from teamcenter.commands import get_command
+
+#seconds before the rules are refreshed, in the background
+REVISION_RULE_TTL = 600
+
+class RevisionRuleIndex(object):
+    '''
+    Revision rules by name and by uid, fetched with one getRevisionRules
+    request. Once older than ttl the index is refreshed on a background
+    thread while lookups keep answering from the current index.
+    '''
+    def __init__(self, ttl=None):
+        self.ttl = REVISION_RULE_TTL if ttl is None else ttl
+        self._by_name = None
+        self._by_uid = None
+        self._fetched_at = None
+        self._lock = threading.Lock()
+        self._refreshing = None
+        self.refreshes = 0
+
+    def update(self, rev_rules):
+        by_name = {}
+        by_uid = {}
+        for rev_rule in rev_rules:
+            by_uid[rev_rule["uid"]] = rev_rule
+            for name in rev_rule["props"]["object_name"]["uiValues"]:
+                by_name.setdefault(name, rev_rule)
+
+        with self._lock:
+            self._by_name = by_name
+            self._by_uid = by_uid
+            self._fetched_at = time.monotonic()
+            self.refreshes += 1
+
+    def refresh(self, conn):
+        grr = get_command('GetRevisionRules')
+        grr.set_cmd()
+        self.update(conn.handle(grr))
+
+    def _refresh_in_background(self, conn):
+        def refresh():
+            try:
+                self.refresh(conn)
+            except Exception:
+                pass #kept answering from the current index, retried on the next lookup
+            finally:
+                with self._lock:
+                    self._refreshing = None
+
+        with self._lock:
+            if self._refreshing is not None:
+                return
+            self._refreshing = threading.Thread(target=refresh, name='tc-revision-rules', daemon=True)
+
+        self._refreshing.start()
+
+    def _index(self, conn):
+        if self._fetched_at is None:
+            #nothing to answer from yet
+            self.refresh(conn)
+        elif time.monotonic() - self._fetched_at > self.ttl:
+            self._refresh_in_background(conn)
+
+    def get(self, conn, name):
+        '''The revision rule model object called name, None if there is none'''
+        self._index(conn)
+        return self._by_name.get(name)
+
+    def get_by_uid(self, conn, uid):
+        self._index(conn)
+        return self._by_uid.get(uid)
+
+    def names(self, conn):
+        self._index(conn)
+        return list(self._by_name)
+
+    def invalidate(self):
+        with self._lock:
+            self._fetched_at = None
+
+
+REVISION_RULE_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+def get_revision_rule_index(alias_name):
+    with _INDEXES_LOCK:
+        index = REVISION_RULE_INDEXES.get(alias_name)
+        if index is None:
+            index = REVISION_RULE_INDEXES[alias_name] = RevisionRuleIndex()
+
+    return index
@@ -28,13 +28,8 @@ __version__ = '0.1'
 __filename__ = 'services.py'
 
 
-import os
-import urllib.parse
-from urllib.request import urlretrieve
 import inspect
 
-import inflection
-    
 class TcRestService(object):
     '''
     A Teamcenter Service having APIs
@@ -42,23 +37,28 @@ class TcRestService(object):
     pass
         
 #note: just add endpoints to add supported APIs!
-API_ENDPOINTS = ['Core-2011-06-Session/login',
-                     'Core-2006-03-Session/logout',
-                     'Query-2010-04-SavedQuery/findSavedQueries',
-                     'Query-2006-03-SavedQuery/describeSavedQueries',
-                     'Query-2006-03-SavedQuery/executeSavedQuery',
-                     'Core-2007-09-DataManagement/loadObjects',
-                     'Core-2006-03-DataManagement/getProperties',
-                     'Core-2007-01-DataManagement/getItemFromId',
-                     'Core-2007-09-DataManagement/expandGRMRelationsForPrimary',
-                     'Core-2016-09-DataManagement/createAttachAndSubmitObjects',
-                     'Core-2008-06-DataManagement/createDatasets2',
-                     'Cad-2007-01-StructureManagement/createBOMWindows',
-                     'Cad-2007-01-StructureManagement/expandPSAllLevels',
-                     'Cad-2007-01-StructureManagement/getRevisionRules',
-                     'Internal-AWS2-2017-06-RequirementsManagement/exportToApplication3',
-                     'AWS2-2018-12-RequirementsManagement/createTracelinks',
-                     ]
+#endpoint: (service, snake case api), precomputed so importing derives nothing
+API_TABLE = {
+    'Core-2011-06-Session/login': ('Session', 'login'),
+    'Core-2006-03-Session/logout': ('Session', 'logout'),
+    'Core-2007-01-Session/getTCSessionInfo': ('Session', 'get_tc_session_info'),
+    'Query-2010-04-SavedQuery/findSavedQueries': ('SavedQuery', 'find_saved_queries'),
+    'Query-2006-03-SavedQuery/describeSavedQueries': ('SavedQuery', 'describe_saved_queries'),
+    'Query-2006-03-SavedQuery/executeSavedQuery': ('SavedQuery', 'execute_saved_query'),
+    'Core-2007-09-DataManagement/loadObjects': ('DataManagement', 'load_objects'),
+    'Core-2006-03-DataManagement/getProperties': ('DataManagement', 'get_properties'),
+    'Core-2007-01-DataManagement/getItemFromId': ('DataManagement', 'get_item_from_id'),
+    'Core-2007-09-DataManagement/expandGRMRelationsForPrimary': ('DataManagement', 'expand_grm_relations_for_primary'),
+    'Core-2016-09-DataManagement/createAttachAndSubmitObjects': ('DataManagement', 'create_attach_and_submit_objects'),
+    'Core-2008-06-DataManagement/createDatasets2': ('DataManagement', 'create_datasets2'),
+    'Cad-2007-01-StructureManagement/createBOMWindows': ('StructureManagement', 'create_bom_windows'),
+    'Cad-2007-01-StructureManagement/expandPSAllLevels': ('StructureManagement', 'expand_ps_all_levels'),
+    'Cad-2007-01-StructureManagement/getRevisionRules': ('StructureManagement', 'get_revision_rules'),
+    'Internal-AWS2-2017-06-RequirementsManagement/exportToApplication3': ('RequirementsManagement', 'export_to_application3'),
+    'AWS2-2018-12-RequirementsManagement/createTracelinks': ('RequirementsManagement', 'create_tracelinks'),
+}
+
+API_ENDPOINTS = list(API_TABLE)
 
 def add_api_to_service(svc, api_name, endpoint):
 
@@ -68,15 +68,7 @@ def add_api_to_service(svc, api_name, endpoint):
     setattr(svc, api_name, classmethod(fn))
 
 
-for endpoint in API_ENDPOINTS:
-    #print('Loading... ' + endpoint)
-    service, api_name = endpoint.rsplit('/',1)
-    
-    #make snake case
-    api_name = inflection.underscore(api_name)
-
-    service_name = service.rsplit('-',1)[1]
-
+for endpoint, (service_name, api_name) in API_TABLE.items():
     if service_name not in globals():
         svc = globals()[service_name] = type(service_name, (TcRestService, ), {})
     else:
@@ -84,8 +76,8 @@ for endpoint in API_ENDPOINTS:
 
     add_api_to_service(svc, api_name, endpoint)
 
+    del(endpoint)
     del(api_name)
-    del(service)
     del(service_name)
     del(svc)
     
@@ -0,0 +1,211 @@
+"""
+    Persistent local cache of requirement specification contents
+"""
+
+__copyright__ = '''
+# //--------------------------------------------------------------------------//
+# //  Siemens Digital Industries Software                                     //
+# //                                                                          //
+# //  (C) Copyright 2022, Siemens                                             //
+# //  All Rights Reserved                                                     //
+'''
+__license__ = '''
+# //  Licensed Materials - Property of Siemens Digital Industries Software    //
+# //                                                                          //
+# //  No part of this file may be reproduced, stored in a retrieval system,   //
+# //  or transmitted in any form or by any means --- electronic, mechanical,  //
+# //  photocopying, recording, or otherwise --- without prior written         //
+# //  permission of Siemens Digital Industries Software.                      //
+# //                                                                          //
+# //  WARRANTY:                                                               //
+# //  Use all material in this file at your own risk. Siemens Digital         //
+# //  Industries Software makes no claims about any material contained in     //
+# //  this file.                                                              //
+# //                                                                          //
+'''
+__authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
+__version__ = '0.1'
+__filename__ = 'speccache.py'
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path, PurePath
+
+CACHE_FILE = 'speccache.sqlite'
+
+#cache root, where the sqlite database is kept
+CACHE_DIR = None
+
+#root of the images referenced by exported html, read by matlab, not moved with the cache
+IMAGE_DIR = None
+
+def default_dir():
+    #the temp directory of matlab requirements on windows
+    temp_dir = PurePath(os.environ["LOCALAPPDATA"], 'Temp') if "LOCALAPPDATA" in os.environ else tempfile.gettempdir()
+    return PurePath(temp_dir, 'RMI', 'TEAMCENTER')
+
+def set_cache_dir(cache_dir):
+    global CACHE_DIR
+    global SPEC_CACHE
+
+    CACHE_DIR = PurePath(cache_dir)
+    SPEC_CACHE = None
+
+def get_cache_dir():
+    global CACHE_DIR
+
+    if CACHE_DIR is None:
+        CACHE_DIR = default_dir()
+
+    return CACHE_DIR
+
+def set_image_dir(image_dir):
+    global IMAGE_DIR
+
+    IMAGE_DIR = PurePath(image_dir)
+
+def get_image_dir():
+    global IMAGE_DIR
+
+    if IMAGE_DIR is None:
+        IMAGE_DIR = default_dir()
+
+    return IMAGE_DIR
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS specs (
+    alias TEXT NOT NULL,
+    spec_uid TEXT NOT NULL,
+    rev_rule TEXT NOT NULL,
+    spec_str TEXT NOT NULL,
+    last_mod_date TEXT,
+    labels TEXT NOT NULL,
+    depths TEXT NOT NULL,
+    locations TEXT NOT NULL,
+    structure TEXT NOT NULL,
+    cached_at REAL NOT NULL,
+    PRIMARY KEY (alias, spec_uid, rev_rule)
+);
+CREATE INDEX IF NOT EXISTS specs_by_str ON specs (alias, spec_str, rev_rule);
+CREATE TABLE IF NOT EXISTS contents (
+    alias TEXT NOT NULL,
+    spec_uid TEXT NOT NULL,
+    rev_rule TEXT NOT NULL,
+    item_str TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    type TEXT NOT NULL,
+    last_mod_date TEXT,
+    html TEXT,
+    PRIMARY KEY (alias, spec_uid, rev_rule, item_str)
+);
+'''
+
+class CachedSpec(object):
+    '''
+    Contents of a specification as cached: labels, depths and locations
+    for matlab, the structure, and per content item its model object
+    reference, last_mod_date and html
+    '''
+    def __init__(self, spec_uid, spec_str, last_mod_date, labels, depths, locations, structure, contents, cached_at):
+        self.spec_uid = spec_uid
+        self.spec_str = spec_str
+        self.last_mod_date = last_mod_date
+        self.labels = labels
+        self.depths = depths
+        self.locations = locations
+        self.structure = structure
+        self.contents = contents
+        self.cached_at = cached_at
+
+class SpecCache(object):
+    '''
+    Specification contents in a sqlite database, keyed by
+    (alias, spec uid, revision rule) and indexed by spec ID_REV.
+    '''
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._local = threading.local()
+        with self._db() as db:
+            db.executescript(SCHEMA)
+
+    def _db(self):
+        #sqlite connections are used in the thread creating them
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+        return db
+
+    def find_spec(self, alias, spec_str, rev_rule):
+        row = self._db().execute(
+            'SELECT spec_uid FROM specs WHERE alias=? AND spec_str=? AND rev_rule=?',
+            (alias, spec_str, rev_rule)).fetchone()
+
+        if row is None:
+            return None
+
+        return self.get_spec(alias, row[0], rev_rule)
+
+    def get_spec(self, alias, spec_uid, rev_rule):
+        db = self._db()
+        row = db.execute(
+            'SELECT spec_str, last_mod_date, labels, depths, locations, structure, cached_at '
+            'FROM specs WHERE alias=? AND spec_uid=? AND rev_rule=?',
+            (alias, spec_uid, rev_rule)).fetchone()
+
+        if row is None:
+            return None
+
+        contents = {}
+        for item_str, uid, obj_type, last_mod_date, html in db.execute(
+                'SELECT item_str, uid, type, last_mod_date, html '
+                'FROM contents WHERE alias=? AND spec_uid=? AND rev_rule=?',
+                (alias, spec_uid, rev_rule)):
+            contents[item_str] = {"uid": uid, "type": obj_type, "last_mod_date": last_mod_date, "html": html}
+
+        spec_str, last_mod_date, labels, depths, locations, structure, cached_at = row
+        return CachedSpec(spec_uid, spec_str, last_mod_date,
+                          json.loads(labels), json.loads(depths), json.loads(locations),
+                          json.loads(structure), contents, cached_at)
+
+    def put_spec(self, alias, rev_rule, spec):
+        '''Replaces the cached contents of the CachedSpec'''
+        with self._db() as db:
+            db.execute('DELETE FROM contents WHERE alias=? AND spec_uid=? AND rev_rule=?',
+                       (alias, spec.spec_uid, rev_rule))
+
+            db.execute('INSERT OR REPLACE INTO specs VALUES (?,?,?,?,?,?,?,?,?,?)',
+                       (alias, spec.spec_uid, rev_rule, spec.spec_str, spec.last_mod_date,
+                        json.dumps(spec.labels), json.dumps(spec.depths), json.dumps(spec.locations),
+                        json.dumps(spec.structure), spec.cached_at or time.time()))
+
+            db.executemany('INSERT OR REPLACE INTO contents VALUES (?,?,?,?,?,?,?,?)',
+                           [(alias, spec.spec_uid, rev_rule, item_str,
+                             content["uid"], content["type"], content.get("last_mod_date"), content.get("html"))
+                            for item_str, content in spec.contents.items()])
+
+    def invalidate(self, alias, spec_uid=None):
+        with self._db() as db:
+            if spec_uid is None:
+                db.execute('DELETE FROM contents WHERE alias=?', (alias,))
+                db.execute('DELETE FROM specs WHERE alias=?', (alias,))
+            else:
+                db.execute('DELETE FROM contents WHERE alias=? AND spec_uid=?', (alias, spec_uid))
+                db.execute('DELETE FROM specs WHERE alias=? AND spec_uid=?', (alias, spec_uid))
+
+
+SPEC_CACHE = None
+_CACHE_LOCK = threading.Lock()
+def get_spec_cache():
+    global SPEC_CACHE
+
+    with _CACHE_LOCK:
+        if SPEC_CACHE is None:
+            SPEC_CACHE = SpecCache(PurePath(get_cache_dir(), CACHE_FILE))
+
+    return SPEC_CACHE
@@ -27,18 +27,51 @@ __authors__ = 'Jason Wickers <jason.wickers@siemens.com>'
 __version__ = '0.1'
 __filename__ = 'tc_slreq.py'
 
-import requests
 import os
 import sys
+import time
 import urllib.parse
-from bs4 import BeautifulSoup
 
-from teamcenter.connection import get_connection, config_alias, reset_connection, set_credential_dir
-from teamcenter.commands import get_command
+from teamcenter.connection import get_connection, config_alias, reset_connection, set_credential_dir, get_configured_alias
+from teamcenter.connection import warm_up as start_warm_up
+from teamcenter.commands import get_command, PropertyPolicy
+from teamcenter.speccache import get_spec_cache, set_cache_dir, CachedSpec
 
-def setup_python(pythonhome):
+#the only properties read from specifications and their contents
+CONTENTS_POLICY = PropertyPolicy({"WorkspaceObject": ["object_string", "object_desc", "last_mod_date"]})
+
+#revision rule used for the structure contents, see set_revision_rule
+REVISION_RULE = 'Latest Working'
+REVISION_RULE_DATE = None
+REVISION_RULE_UNIT_NO = None
+
+#persistent cache of specification contents, see set_spec_cache
+SPEC_CACHE_ENABLED = False
+SPEC_CACHE_CHECK_FRESH = True
+SPEC_CACHE_INCREMENTAL = False
+
+def setup_python(pythonhome, warm_up=False):
+    """Sets the python home of the credential files
+
+    Parameters
+    ----------
+    pythonhome : str
+        home of the python running, the credential files are in its teamcenter directory
+
+    warm_up : bool, optional
+        logs in and resolves the revision rule and saved queries on a background
+        thread, the first call waits for it instead of logging in (default is False)
+
+    Returns
+    ----------
+    None
+        returns nothing
+    """
     set_credential_dir(pythonhome)
 
+    if warm_up:
+        start_warm_up(revision_rules=(REVISION_RULE,))
+
 def get_spec(tc_url):
     """Gets the specification from Teamcenter
     
@@ -67,7 +100,8 @@ def get_spec(tc_url):
     
     #Get the RequirementSpec model object
     lo = get_command('LoadObjects')
-    lo.set_cmd([spec_uid])
+    lo.set_cmd([spec_uid], props=['object_string', 'object_desc'])
+    lo.set_property_policy(CONTENTS_POLICY)
     tc_spec = conn.handle(lo)[0]
         
     specId = tc_spec["props"]["object_string"]["uiValues"][0].split(';')[0]
@@ -113,6 +147,7 @@ def get_summary(doc, location):
     #Get the item rev object
     gifi = get_command('GetItemFromId')
     gifi.set_cmd(itemId, itemRev)
+    gifi.set_property_policy(CONTENTS_POLICY)
     item_rev = conn.handle(gifi)
 
     #Get the name of the item rev object (which is the summary)
@@ -120,6 +155,49 @@ def get_summary(doc, location):
     
     return name
 
+def get_summaries(doc, locations):
+    """Gets the summaries of many items from Teamcenter
+    
+    Same as get_summary for each location, resolving the items with
+    batched getItemFromId requests instead of one request per item
+    
+    Parameters
+    ----------
+    doc : str
+        document requirements are within in form of ID_REV, example:  SPEC-00001_A
+
+    locations : list
+        requirements to get the summary for in form of ID_REV, example:  REQ-00001_A
+    
+    Returns
+    -------
+    list
+        the names aligned with locations, None for items not found in Teamcenter
+    """
+
+    #get our connection to Teamcenter
+    conn = get_connection()
+
+    locations = [location if location else doc for location in locations]
+
+    gifis = get_command('GetItemsFromIds')
+    gifis.set_cmd(locations)
+    gifis.set_property_policy(CONTENTS_POLICY)
+    item_revs = conn.handle(gifis)
+
+    if gifis.missing:
+        print('Items not found: {}'.format(', '.join(gifis.missing)))
+
+    names = []
+    for location in locations:
+        item_rev = item_revs[location]
+        if item_rev is None:
+            names.append(None)
+        else:
+            names.append(item_rev["props"]["object_string"]["uiValues"][0])
+
+    return names
+
 
 def get_viewable_html(doc, location):
     """Gets html formatted text of a requirement/paragraph
@@ -152,7 +230,7 @@ def get_viewable_html(doc, location):
     
     item_str = itemId+"_"+itemRev
     
-    html = gh.htmltextcache.get(item_str, '<b>Failed to Get HTML!</b>')
+    html = gh.html_cache(get_configured_alias().name).get(item_str, '<b>Failed to Get HTML!</b>')
     
     return html
 
@@ -177,7 +255,8 @@ def get_viewable_text(doc, location):
     """
     vhtml = get_viewable_html(doc, location)
 
-    #use beautifulsoup on html to change to text only
+    #use beautifulsoup on html to change to text only, imported on first use
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(vhtml, 'html.parser')
     
     return str(soup.get_text())
@@ -225,12 +304,28 @@ def get_url(document, location):
         traceback.print_tb(sys.exc_info()[2])
         raise(e)
 
-def cache_all_html(conn, tc_spec_contents):
+#requirement revisions exported per exportToApplication3 request
+HTML_CHUNK_SIZE = 50
+#chunks exported at once, each over its own session
+HTML_MAX_CONCURRENCY = 4
+
+def item_str_of(tc_obj):
+    """Identifier of a requirement/paragraph in form of ID_REV, example:  REQ-00001_A"""
+    val = tc_obj["props"]["object_string"]["uiValues"][0]
+    part = val.split(';',1)[0]
+    itemRev = part.rsplit('/',1)[-1]
+    itemId = part.rsplit('/',1)[0]
+    return itemId + "_" + itemRev
+
+def cache_all_html(conn, tc_spec_contents, chunk_size=None, max_concurrency=None, stats=None):
     """Caches html text for all contents of a requirements specificiation
     
     For all the paragraphs/requirements in a specification, gets the html
     text and downloads all images relevant. Caching them locally for later
     viewing.
+
+    The contents are exported in chunks sent concurrently, each chunk is
+    cached as soon as its response arrives.
     
     Parameters
     ----------
@@ -239,33 +334,77 @@ def cache_all_html(conn, tc_spec_contents):
         
     tc_spec_contents : list
         list of Teamcenter requirement/paragraph objects
+
+    chunk_size : int, optional
+        contents per export request (default is HTML_CHUNK_SIZE)
+
+    max_concurrency : int, optional
+        export requests in flight at once (default is HTML_MAX_CONCURRENCY)
+
+    stats : dict, optional
+        set with the number of images and their total download time in seconds
     
     Returns
     -------
     list
         an ordered list of all html content aligned with tc_spec_contents
     """
-    item_strs = []
-    
-    for tc_obj in tc_spec_contents:
-        val = tc_obj["props"]["object_string"]["uiValues"][0]
-        part = val.split(';',1)[0]
-        itemRev = part.rsplit('/',1)[-1]
-        itemId = part.rsplit('/',1)[0]
-        item_strs.append(itemId + "_" + itemRev)
+    chunk_size = chunk_size or HTML_CHUNK_SIZE
+    max_concurrency = max_concurrency or HTML_MAX_CONCURRENCY
 
-    gh = get_command('GetHTML')
-    gh.set_cmd(item_strs, tc_spec_contents)
+    item_strs = [item_str_of(tc_obj) for tc_obj in tc_spec_contents]
+
+    ghs = []
+    for start in range(0, len(item_strs), chunk_size):
+        gh = get_command('GetHTML')
+        gh.set_cmd(item_strs[start:start+chunk_size], tc_spec_contents[start:start+chunk_size])
+        ghs.append(gh)
+
+    if len(ghs) <= 1:
+        result = [html for gh in ghs for html in conn.handle(gh)]
 
-    result = conn.handle(gh)
+    else:
+        result = []
+        for htmls in conn.handle_many(ghs, max_concurrency=max_concurrency):
+            if isinstance(htmls, Exception):
+                raise htmls
+            result.extend(htmls)
+
+    if stats is not None:
+        spans = [gh.image_download_span for gh in ghs if gh.image_download_span]
+        stats["images"] = sum(gh.image_count for gh in ghs)
+        stats["image_download_time"] = max(span[1] for span in spans) - min(span[0] for span in spans) if spans else 0.0
     
     return result
 
 
+def index_contents(tc_spec_contents):
+    """Indexes the children of each parent in a structure expansion
+    
+    Parameters
+    ----------
+    tc_spec_contents : dict
+        expandPSAllLevels result of the requirement spec
+        
+    Returns
+    -------
+    dict
+        children of the expansion output keyed by the parent itemRevOfBOMLine uid
+    """
+    children_index = {}
+    for structure in tc_spec_contents["output"]:
+        if not structure["parent"]: continue
+        
+        #first structure found for a parent wins
+        children_index.setdefault(structure["parent"]["itemRevOfBOMLine"]["uid"], structure["children"])
+
+    return children_index
+
+
 def matlab_content(tc_parent, tc_spec_contents, labels, depths, locations, depth=0):
     """Structures requirement spec contents for matlab
     
-    Recursively formats labels, depths, and locations information which is a result
+    Formats labels, depths, and locations information in pre-order, which is a result
     for the get_contents function
     
     Parameters
@@ -294,17 +433,15 @@ def matlab_content(tc_parent, tc_spec_contents, labels, depths, locations, depth
     None
         labels, depths, and locations are set directly in given parameter list references
     """
-    children = []
-    for structure in tc_spec_contents["output"]:
-        if not structure["parent"]: continue
-        
-        if structure["parent"]["itemRevOfBOMLine"]["uid"] == tc_parent["uid"]:
-            children = structure["children"]
-            break
+    children_index = index_contents(tc_spec_contents)
+    model_objects = tc_spec_contents["ServiceData"]["modelObjects"]
 
-    for child in children:
+    #iterative pre-order traversal, children pushed in reverse to keep their order
+    stack = [(child, depth) for child in reversed(children_index.get(tc_parent["uid"], []))]
+    while stack:
+        child, child_depth = stack.pop()
         child_uid = child["itemRevOfBOMLine"]["uid"]
-        tc_req = tc_spec_contents["ServiceData"]["modelObjects"][child_uid]
+        tc_req = model_objects[child_uid]
 
         reqName = tc_req["props"]["object_string"]["uiValues"][0].split(';')[-1].split('-',1)[-1]
 
@@ -313,28 +450,371 @@ def matlab_content(tc_parent, tc_spec_contents, labels, depths, locations, depth
         reqRev = part.split('/')[-1]
         reqId = part.split('/')[0]
 
-
-        location = tc_req["uid"]
         labels.append(reqName)
         locations.append(reqId + "_" + reqRev)
-        depths.append(depth)
+        depths.append(child_depth)
+
+        stack.extend((grandchild, child_depth+1) for grandchild in reversed(children_index.get(child_uid, [])))
+
+
+def structure_of(tc_spec_contents):
+    """Compact structure of a structure expansion, as kept in the spec cache
+    
+    Parameters
+    ----------
+    tc_spec_contents : dict
+        expandPSAllLevels result of the requirement spec
+        
+    Returns
+    -------
+    dict
+        children uids by parent uid, and uid, type and object_string of the contents
+    """
+    objects = {}
+    for uid, o in tc_spec_contents["ServiceData"]["modelObjects"].items():
+        if "object_string" in o.get("props", {}):
+            objects[uid] = {"uid": uid, "type": o["type"],
+                            "object_string": o["props"]["object_string"]["uiValues"][0]}
+
+    children = dict((parent_uid, [child["itemRevOfBOMLine"]["uid"] for child in kids])
+                    for parent_uid, kids in index_contents(tc_spec_contents).items())
+
+    return {"children": children, "objects": objects}
+
+
+def structure_of_stream(events):
+    """Compact structure of a streamed structure expansion, see structure_of
+    
+    Builds the structure while the expansion is parsed, keeping only the
+    compact form of each record and model object in memory
+    
+    Parameters
+    ----------
+    events : iterable
+        ExpandPSAllLevels stream events
+        
+    Returns
+    -------
+    dict
+        children uids by parent uid, and uid, type and object_string of the contents
+    """
+    children = {}
+    objects = {}
+    for path, uid, value in events:
+        if path == 'output':
+            if not value["parent"]: continue
+
+            #first structure found for a parent wins
+            parent_uid = value["parent"]["itemRevOfBOMLine"]["uid"]
+            if parent_uid not in children:
+                children[parent_uid] = [child["itemRevOfBOMLine"]["uid"] for child in value["children"]]
+
+        elif "object_string" in value.get("props", {}):
+            objects[uid] = {"uid": uid, "type": value["type"],
+                            "object_string": value["props"]["object_string"]["uiValues"][0]}
+
+    return {"children": children, "objects": objects}
+
+
+def contents_of(structure):
+    """Structure expansion rebuilt from a compact structure, see structure_of"""
+    output = [{"parent": {"itemRevOfBOMLine": {"uid": parent_uid}},
+               "children": [{"itemRevOfBOMLine": {"uid": uid}} for uid in kids]}
+              for parent_uid, kids in structure["children"].items()]
+
+    model_objects = dict((uid, {"uid": uid, "type": o["type"],
+                                "props": {"object_string": {"uiValues": [o["object_string"]]}}})
+                         for uid, o in structure["objects"].items())
+
+    return {"output": output, "ServiceData": {"modelObjects": model_objects}}
+
+
+def set_revision_rule(rev_rule_name='Latest Working', date=None, unit_no=None):
+    """Configures the revision rule used for the structure contents
+    
+    Parameters
+    ----------
+    rev_rule_name : str, optional
+        name of the revision rule (default is Latest Working)
+
+    date : datetime or str, optional
+        effectivity date of the revision rule (default is today)
+
+    unit_no : int, optional
+        effectivity unit number of the revision rule
+    
+    Returns
+    ----------
+    None
+        returns nothing
+    """
+    global REVISION_RULE
+    global REVISION_RULE_DATE
+    global REVISION_RULE_UNIT_NO
+
+    if hasattr(date, 'isoformat'):
+        date = date.isoformat()
+
+    REVISION_RULE = rev_rule_name
+    REVISION_RULE_DATE = date
+    REVISION_RULE_UNIT_NO = unit_no
+
+def revision_rule_key():
+    """The revision rule with its effectivity, as cached specs are keyed"""
+    key = REVISION_RULE
+    if REVISION_RULE_DATE:
+        key += ';date=' + REVISION_RULE_DATE
+    if REVISION_RULE_UNIT_NO is not None:
+        key += ';unit=' + str(REVISION_RULE_UNIT_NO)
+
+    return key
 
-        matlab_content(tc_req, tc_spec_contents, labels, depths, locations, depth+1)
 
+def set_spec_cache(enabled=True, check_fresh=True, incremental=False, cache_dir=None):
+    """Configures the persistent cache of specification contents
+    
+    Parameters
+    ----------
+    enabled : bool, optional
+        get_contents loads from and saves to the cache (default is True)
+
+    check_fresh : bool, optional
+        compare the structure, and last_mod_date of the spec and of its
+        requirements in one request, before loading from the cache, otherwise
+        load without connecting (default is True)
+
+    incremental : bool, optional
+        refresh cached specs incrementally, re-exporting only the contents
+        changed since cached (default is False)
+
+    cache_dir : str, optional
+        directory of the cache database, the requirement images stay in the
+        directory matlab reads them from, see speccache.set_image_dir
+    
+    Returns
+    ----------
+    None
+        returns nothing
+    """
+    global SPEC_CACHE_ENABLED
+    global SPEC_CACHE_CHECK_FRESH
+    global SPEC_CACHE_INCREMENTAL
+
+    SPEC_CACHE_ENABLED = enabled
+    SPEC_CACHE_CHECK_FRESH = check_fresh
+    SPEC_CACHE_INCREMENTAL = incremental
+
+    if cache_dir:
+        set_cache_dir(cache_dir)
+
+
+def get_properties(conn, tc_objs, attributes):
+    """Gets current properties of Teamcenter objects, in one request
+    
+    Parameters
+    ----------
+    conn : TcConnection
+        connection to Teamcenter
+        
+    tc_objs : list
+        Teamcenter objects
+
+    attributes : list
+        names of the properties
+    
+    Returns
+    -------
+    dict
+        model objects by uid
+    """
+    if not tc_objs:
+        return {}
+
+    gp = get_command('GetProperties')
+    gp.set_cmd([{"uid": tc_obj["uid"], "type": tc_obj["type"]} for tc_obj in tc_objs], attributes)
+    result = conn.handle(gp)
+
+    return result["modelObjects"]
+
+
+def last_mod_date_of(tc_obj):
+    try:
+        return tc_obj["props"]["last_mod_date"]["dbValues"][0]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def contents_fresh(conn, cached):
+    """Whether no content of a cached spec was modified since cached, checked in one request"""
+    contents = list(cached.contents.values())
+    current = get_properties(conn, contents, ["last_mod_date"])
+
+    for content in contents:
+        last_mod_date = last_mod_date_of(current.get(content["uid"]))
+        if last_mod_date is None or last_mod_date != content["last_mod_date"]:
+            return False
+
+    return True
+
+
+def load_cached_contents(cached):
+    """Sets the html cache from a cached spec and returns its contents for matlab"""
+    html_cache = get_command('GetHTML').html_cache(get_configured_alias().name)
+    for item_str, content in cached.contents.items():
+        if content["html"] is not None:
+            html_cache[item_str] = content["html"]
+
+    return cached.labels, cached.depths, cached.locations
+
+
+def expand_spec(conn, tc_spec, stream=False):
+    """Expands all levels of the specification structure
+    
+    Parameters
+    ----------
+    conn : TcConnection
+        connection to Teamcenter
+        
+    tc_spec : dict
+        RequirementSpec revision model object
+
+    stream : bool, optional
+        return the expansion as stream events to be consumed, see
+        structure_of_stream (default is False)
+    
+    Returns
+    -------
+    dict
+        expandPSAllLevels result of the requirement spec
+    """
+    #Get the Revision Rule used for the structure contents
+    grr = get_command('GetRevisionRule')
+    grr.set_cmd(REVISION_RULE)
+    rev_rule = conn.handle(grr)
+    
+    #Get the structure contents of the RequirementSpec
+    print('...retrieving specification structure',end='')
+    
+    cbw = get_command('CreateBOMWindow')
+    cbw.set_cmd(tc_spec, rev_rule, REVISION_RULE_DATE, REVISION_RULE_UNIT_NO)
+    
+    bom_window_line = conn.handle(cbw)
+    
+    expandall = get_command('ExpandPSAllLevels')
+    expandall.set_cmd(bom_window_line, stream=stream)
+    expandall.set_property_policy(CONTENTS_POLICY)
+    tc_spec_contents = conn.handle(expandall)
+    
+    print('. completed.')
+
+    return tc_spec_contents
+
+
+def update_contents(conn, tc_spec, spec_str, spec_last_mod_date, structure, previous):
+    """Updates cached contents of a specification to its structure
+    
+    Gets last_mod_date of all requirements of the structure in one request,
+    and exports the html of only the requirements changed or new compared
+    to the previously cached contents.
+    
+    Parameters
+    ----------
+    conn : TcConnection
+        connection to Teamcenter
+        
+    tc_spec : dict
+        RequirementSpec revision model object
+
+    spec_str : str
+        spec identifier in form of ID_REV, example:  SPEC-00001_A
+
+    spec_last_mod_date : str
+        last_mod_date of the spec
+
+    structure : dict
+        compact structure of the spec, object strings are updated in place
+
+    previous : dict
+        previously cached contents by ID_REV, empty if none
+    
+    Returns
+    -------
+    CachedSpec
+        the updated contents to cache
+    """
+    req_objs = [o for o in structure["objects"].values() if "Requirement Revision" in o["type"]]
+    current = get_properties(conn, req_objs, ["object_string", "last_mod_date"])
+
+    contents = {}
+    changed = []
+    for o in req_objs:
+        mo = current.get(o["uid"])
+        if mo is None or "object_string" not in mo.get("props", {}):
+            mo = {"uid": o["uid"], "type": o["type"],
+                  "props": {"object_string": {"uiValues": [o["object_string"]]}}}
+        else:
+            o["object_string"] = mo["props"]["object_string"]["uiValues"][0]
+
+        item_str = item_str_of(mo)
+        last_mod_date = last_mod_date_of(mo)
+
+        content = previous.get(item_str)
+        if (content is not None and content["uid"] == o["uid"] and content["html"] is not None
+                and last_mod_date is not None and content["last_mod_date"] == last_mod_date):
+            contents[item_str] = content
+        else:
+            contents[item_str] = {"uid": o["uid"], "type": o["type"], "last_mod_date": last_mod_date, "html": None}
+            changed.append(mo)
+
+    #Cache the HTML of changed contents
+    print('...retrieving text for {} of {} contents'.format(len(changed), len(req_objs)),end='')
+
+    stats = {}
+    htmls = cache_all_html(conn, changed, stats=stats)
+    for mo, html in zip(changed, htmls):
+        contents[item_str_of(mo)]["html"] = html
+
+    print('. completed ({} images downloaded in {:.2f}s).'.format(stats["images"], stats["image_download_time"]))
 
-def get_contents(spec_identifier):
+    #Format the contents for matlab import
+    labels, depths, locations = [],[],[]
+    matlab_content(tc_spec, contents_of(structure), labels, depths, locations)
+
+    return CachedSpec(tc_spec["uid"], spec_str, spec_last_mod_date, labels, depths, locations,
+                      structure, contents, time.time())
+
+
+def get_contents(spec_identifier, use_cache=None, check_fresh=None, incremental=None):
     """Obtain all content of a requirement specification from Teamcenter
     
     Queries the full requirement specification in Teamcenter finding all
     paragraphs/requirements within, their names, ids, revision, and text.
     
     Caches text for later retrieval.
+
+    With the spec cache enabled, contents are loaded from the persistent
+    cache when present (and still fresh if checked: the same structure, and
+    neither the spec nor any of its requirements modified since cached), and
+    saved to it otherwise. Incrementally, the structure is expanded again and
+    only the html of new or changed requirements is exported.
     
     Parameters
     ----------
     spec_identifier : str
         requirement specification to get contents from in form of ID_REV, 
         example:  SPEC-00001_A
+
+    use_cache : bool, optional
+        use the spec cache (default is set by set_spec_cache, disabled)
+
+    check_fresh : bool, optional
+        compare the structure, and last_mod_date of the spec and of its
+        requirements, before using the cache (default is set by
+        set_spec_cache, enabled)
+
+    incremental : bool, optional
+        refresh the cached spec incrementally (default is set by
+        set_spec_cache, disabled)
     
     Returns
     -------
@@ -342,38 +822,57 @@ def get_contents(spec_identifier):
         a tuple containing labels of requirements, position in requirement spec,
         and their identifier
     """
-    
-    #get our connection to Teamcenter
-    conn = get_connection()
+    if use_cache is None:
+        use_cache = SPEC_CACHE_ENABLED
+    if check_fresh is None:
+        check_fresh = SPEC_CACHE_CHECK_FRESH
+    if incremental is None:
+        incremental = SPEC_CACHE_INCREMENTAL
     
     #split spec_identifier, ex: VnV_030116_A;ACC Specification
     part = spec_identifier.split(';')[0]
     specRev = part.rsplit('_',1)[-1]
     specId = part.rsplit('_',1)[0]
+    spec_str = specId + "_" + specRev
 
     try:
+        if use_cache and not check_fresh and not incremental:
+            cached = get_spec_cache().find_spec(get_configured_alias().name, spec_str, revision_rule_key())
+            if cached is not None:
+                return load_cached_contents(cached)
+
+        #get our connection to Teamcenter
+        conn = get_connection()
+
         gifi = get_command('GetItemFromId')
         gifi.set_cmd(specId, specRev)
+        gifi.set_property_policy(CONTENTS_POLICY)
         tc_spec = conn.handle(gifi)
-        
-        #Get the Revision Rule used for the structure contents
-        grr = get_command('GetRevisionRule')
-        grr.set_cmd('Latest Working')
-        rev_rule = conn.handle(grr)
-        
-        #Get the structure contents of the RequirementSpec
-        print('...retrieving specification structure',end='')
-        
-        cbw = get_command('CreateBOMWindow')
-        cbw.set_cmd(tc_spec, rev_rule)
-        
-        bom_window_line = conn.handle(cbw)
-        
-        expandall = get_command('ExpandPSAllLevels')
-        expandall.set_cmd(bom_window_line)
-        tc_spec_contents = conn.handle(expandall)
-        
-        print('. completed.')
+
+        if use_cache:
+            spec_last_mod_date = last_mod_date_of(get_properties(conn, [tc_spec], ["last_mod_date"]).get(tc_spec["uid"]))
+            cached = get_spec_cache().get_spec(conn.alias.name, tc_spec["uid"], revision_rule_key())
+
+            #requirements added or removed change the BOMViewRevision, not the spec: always expand,
+            #the structure is cheap next to the html
+            structure = structure_of_stream(expand_spec(conn, tc_spec, stream=True))
+
+            if cached is not None and not incremental:
+                if (spec_last_mod_date is not None and cached.last_mod_date == spec_last_mod_date
+                        and structure["children"] == cached.structure["children"]
+                        and contents_fresh(conn, cached)):
+                    return load_cached_contents(cached)
+
+            previous = cached.contents if cached is not None and incremental else {}
+            spec = update_contents(conn, tc_spec, spec_str, spec_last_mod_date, structure, previous)
+
+            #an expansion without the spec itself is not a structure to serve from the cache
+            if tc_spec["uid"] in structure["children"]:
+                get_spec_cache().put_spec(conn.alias.name, revision_rule_key(), spec)
+
+            return load_cached_contents(spec)
+
+        tc_spec_contents = expand_spec(conn, tc_spec)
         
         tc_objs = []
         for o in  tc_spec_contents["ServiceData"]["modelObjects"].values():
@@ -383,9 +882,10 @@ def get_contents(spec_identifier):
         #Cache all the HTML
         print('...retrieving text for contents',end='')
 
-        cache_all_html(conn,tc_objs)
+        stats = {}
+        cache_all_html(conn,tc_objs, stats=stats)
             
-        print('. completed.')
+        print('. completed ({} images downloaded in {:.2f}s).'.format(stats["images"], stats["image_download_time"]))
         
         #Format the contents for matlab import
         labels, depths, locations = [],[],[]